@@ -3,45 +3,39 @@ from __future__ import annotations
 import logging
 from typing import Optional
 from datetime import datetime
-import time as _time
 import os
+import sys
 
 import typer
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 
-from .core.config import get_config
-from .db.engine import init_db
-from .db.repo import (
-    session_scope,
-    upsert_price,
-    list_prices,
-    get_asset_preference,
-    set_asset_preference,
-    create_account,
-    list_accounts,
-    create_transaction,
-)
-from .db.models import AccountType, TxSide
-from .core.valuation import summarize_portfolio
+from .core.config import child_env, get_config
+from wealth_os.cli.lazy import lazy_group
 from wealth_os.cli.ui import fmt_decimal, fmt_money, colorize_pnl
 from wealth_os.core.context import load_context
-from .cli.account import app as account_app
-from .cli.tx import app as tx_app
-from .cli.import_cmd import app as import_app
-from .cli.export_cmd import app as export_app
-from .cli.chart import app as chart_app
-from .cli.report import app as report_app
-from .cli.context_cmd import app as context_app
-import subprocess
-import shutil
-import threading
-from uvicorn import Config as UvicornConfig, Server as UvicornServer
 from pathlib import Path
 
 
-app = typer.Typer(help="Wealth CLI — manage crypto transactions and reports.")
+# Domain sub-apps are imported on first use so short commands (and `config`)
+# don't pay for SQLAlchemy, pandas or matplotlib at startup.
+_LAZY_SUBCOMMANDS = {
+    "account": "wealth_os.cli.account:app",
+    "tx": "wealth_os.cli.tx:app",
+    "import": "wealth_os.cli.import_cmd:app",
+    "export": "wealth_os.cli.export_cmd:app",
+    "chart": "wealth_os.cli.chart:app",
+    "report": "wealth_os.cli.report:app",
+    "context": "wealth_os.cli.context_cmd:app",
+}
+# Subcommands that never touch the database
+_NO_DB_SUBCOMMANDS = {"config", "datasource", "context"}
+
+app = typer.Typer(
+    help="Wealth CLI — manage crypto transactions and reports.",
+    cls=lazy_group(_LAZY_SUBCOMMANDS),
+)
 console = Console()
 
 
@@ -51,8 +45,13 @@ def _setup_logging(verbosity: int) -> None:
         level = logging.DEBUG
     elif verbosity == 1:
         level = logging.INFO
+    root = logging.getLogger()
+    if root.level == level and root.handlers:
+        return
+    root.setLevel(level)
+    # basicConfig is a no-op once handlers exist, so the stderr handler is
+    # only created the first time logging is configured
     logging.basicConfig(
-        level=level,
         format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
     )
 
@@ -68,8 +67,11 @@ def _app_callback(
     _setup_logging(verbose)
     # Ensure .env is loaded early for all commands
     cfg = get_config()
-    # Ensure DB exists and new tables are created (simple create_all)
+    if ctx.invoked_subcommand is None or ctx.invoked_subcommand in _NO_DB_SUBCOMMANDS:
+        return
     try:
+        from .db.engine import init_db
+
         init_db(cfg.db_path)
     except Exception:
         # Best-effort; commands can also initialize explicitly
@@ -79,6 +81,8 @@ def _app_callback(
 @app.command()
 def init() -> None:
     """Initialize the local SQLite database using current configuration."""
+    from .db.engine import init_db
+
     cfg = get_config()
     init_db(cfg.db_path)
     typer.echo(f"Initialized database at: {cfg.db_path}")
@@ -109,21 +113,20 @@ def datasource_list() -> None:
     """List available price and import datasources."""
     # Ensure providers are imported and registered
     import wealth_os.datasources  # noqa: F401
-    from wealth_os.datasources.registry import get_import_sources, get_price_sources
-
-    price_sources = sorted(get_price_sources().keys())
-    import_sources = sorted(get_import_sources().keys())
+    from wealth_os.datasources.registry import (
+        get_import_source_names,
+        get_price_source_names,
+    )
 
     pt = Table(title="Price Sources")
     pt.add_column("Name")
-    for k in price_sources:
+    for k in get_price_source_names():
         pt.add_row(k)
     it = Table(title="Import Sources")
     it.add_column("Name")
-    for k in import_sources:
+    for k in get_import_source_names():
         it.add_row(k)
-    console.print(pt)
-    console.print(it)
+    console.print(pt, it)
 
 
 app.add_typer(datasource_app, name="datasource")
@@ -132,6 +135,44 @@ app.add_typer(datasource_app, name="datasource")
 price_app = typer.Typer(help="Price data commands")
 
 
+def _base_provider_order(
+    cli_providers: Optional[str], ctx_providers: Optional[str]
+) -> tuple[str, ...]:
+    """Provider order from --providers, else context, else env/default."""
+    from wealth_os.datasources.registry import (
+        DEFAULT_PROVIDER_ORDER,
+        parse_provider_order,
+    )
+
+    if cli_providers:
+        return parse_provider_order(cli_providers)
+    return parse_provider_order(
+        ctx_providers
+        or os.getenv("WEALTH_PRICE_PROVIDER_ORDER", DEFAULT_PROVIDER_ORDER)
+    )
+
+
+def _provider_order(
+    preferred: Optional[str], base_order: tuple[str, ...], available
+) -> list[str]:
+    """Per-asset preference first, then the base order, without duplicates.
+
+    Names not in ``available`` (the registered sources) are dropped.
+    """
+    names = (preferred, *base_order) if preferred else base_order
+    return [n for n in dict.fromkeys(names) if n in available]
+
+
+def _parse_symbols(raw: str) -> tuple[str, ...]:
+    """Split a comma-separated asset list into unique, interned upper-case symbols."""
+    tokens = (tok.strip().upper() for tok in raw.split(","))
+    return tuple(dict.fromkeys(sys.intern(tok) for tok in tokens if tok))
+
+
+# Default upper bound on concurrent provider fetches during `price sync`
+_SYNC_MAX_WORKERS = 8
+
+
 @price_app.command("sync")
 def price_sync(
     assets: str = typer.Option(
@@ -152,90 +193,144 @@ def price_sync(
         "--providers",
         help="Comma-separated provider order, e.g., coindesk,coinmarketcap",
     ),
+    workers: int = typer.Option(
+        _SYNC_MAX_WORKERS,
+        "--workers",
+        min=1,
+        help="Symbols fetched concurrently (providers stay rate limited)",
+    ),
+    refetch: bool = typer.Option(
+        False,
+        "--refetch",
+        help="Download the whole range even where daily prices are already stored",
+    ),
 ) -> None:
     """Fetch historical prices from CoinMarketCap and store in DB."""
     # Ensure providers are registered
     import wealth_os.datasources  # noqa: F401
-    from wealth_os.datasources.registry import get_price_sources
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from datetime import time, timedelta
+
+    from wealth_os.datasources.registry import get_price_source, get_price_sources
+    from .db.repo import (
+        session_scope,
+        get_asset_preferences,
+        get_daily_price_coverage,
+        set_asset_preference,
+        upsert_prices_bulk,
+    )
 
     cfg = get_config()
     until = until or datetime.utcnow()
     all_sources = get_price_sources()
     ctx = load_context()
     quote = quote or ctx.quote or get_config().base_currency
-    default_order = [
-        s.strip()
-        for s in (
-            ctx.providers
-            or os.getenv("WEALTH_PRICE_PROVIDER_ORDER", "coinmarketcap,coindesk")
-        ).split(",")
-        if s.strip()
-    ]
-    cli_order = [s.strip() for s in providers.split(",")] if providers else None
-    base_order = cli_order or default_order
-    symbols = [s.strip().upper() for s in assets.split(",") if s.strip()]
+    base_order = _base_provider_order(providers, ctx.providers)
+    symbols = _parse_symbols(assets)
+
+    def _fetch_one(sym: str, preferred: Optional[str], start: datetime):
+        """Run the provider fallback ladder for one symbol (no DB access).
+
+        Returns ``(sym, source_id, points, error)``; runs on a worker thread.
+        """
+        order = _provider_order(preferred, base_order, all_sources)
+
+        last_err = None
+        for prov_name in order:
+            try:
+                src = get_price_source(prov_name)
+            except Exception as e:
+                last_err = e
+                continue
+            typer.echo(
+                f"Syncing {sym} via {prov_name} {quote} {interval} from {start.date()} to {until.date()}..."
+            )
+            try:
+                # Drain every page here: providers pace each request on their
+                # bucket, so the main thread only ever writes finished rows.
+                points = list(
+                    src.get_ohlcv(
+                        sym, start=start, end=until, interval=interval, quote=quote
+                    )
+                )
+            except Exception as e:
+                last_err = e
+                typer.echo(f"  Provider {prov_name} failed: {e}")
+                continue
+            if not points:
+                typer.echo(f"  Provider {prov_name} returned no data; trying next")
+                continue
+            return sym, src.id(), points, None
+        msg = f"Failed to sync {sym} from all providers"
+        if last_err:
+            msg += f": last error: {last_err}"
+        return sym, None, [], msg
 
     total = 0
+    failures: list[str] = []
     try:
-        for sym in symbols:
-            # Build order using per-asset preference then base order
-            with session_scope(cfg.db_path) as s:
-                preferred = get_asset_preference(s, sym)
-            order = []
-            if preferred:
-                order.append(preferred)
-            for name in base_order:
-                if name not in order:
-                    order.append(name)
-
-            last_err = None
-            success = False
-            for prov_name in order:
-                if prov_name not in all_sources:
-                    continue
-                try:
-                    src_cls = all_sources[prov_name]
-                    src = src_cls()  # type: ignore[call-arg]
-                except Exception as e:
-                    last_err = e
-                    continue
-                typer.echo(
-                    f"Syncing {sym} via {prov_name} {quote} {interval} from {since.date()} to {until.date()}..."
-                )
-                try:
-                    points = src.get_ohlcv(
-                        sym, start=since, end=until, interval=interval, quote=quote
+        # Preferences and coverage are read up front in a read session;
+        # fetches then run with no transaction open, and each symbol's rows
+        # are written in their own short write transaction as they arrive,
+        # so the SQLite write lock is never held across network calls.
+        with session_scope(cfg.db_path) as s:
+            preferences = get_asset_preferences(s, symbols)
+            # Incremental daily sync: skip the days already stored contiguously
+            # from the first requested day; gaps or an earlier --since backfill.
+            # The newest stored day is fetched again, since its candle may have
+            # been stored while the day was still open.
+            starts = {sym: since for sym in symbols}
+            if not refetch and interval in ("1d", "daily"):
+                first_day = datetime.combine(since.date(), time.min)
+                if first_day < since:
+                    first_day += timedelta(days=1)
+                for sym in symbols:
+                    lo, hi, n = get_daily_price_coverage(
+                        s,
+                        asset_symbol=sym,
+                        quote_ccy=quote,
+                        start=since,
+                        end=until,
+                        sources=_provider_order(
+                            preferences[sym], base_order, all_sources
+                        ),
                     )
-                except Exception as e:
-                    last_err = e
-                    typer.echo(f"  Provider {prov_name} failed: {e}")
+                    if lo is None or lo > first_day or n != (hi - lo).days + 1:
+                        continue
+                    starts[sym] = max(since, hi)
+        workers = max(1, min(len(symbols), workers))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futures = [
+                ex.submit(_fetch_one, sym, preferences[sym], starts[sym])
+                for sym in symbols
+            ]
+            for fut in as_completed(futures):
+                sym, source_id, points, err = fut.result()
+                if err:
+                    failures.append(err)
                     continue
-                if not points:
-                    typer.echo(f"  Provider {prov_name} returned no data; trying next")
-                    continue
-                with session_scope(cfg.db_path) as s:
-                    for p in points:
-                        upsert_price(
+                # One transaction per symbol: a failed write only drops it
+                try:
+                    with session_scope(cfg.db_path, write=True) as s:
+                        written = upsert_prices_bulk(
                             s,
                             asset_symbol=sym,
                             quote_ccy=quote,
-                            ts=p.ts,
-                            price=p.close,
-                            source=src.id(),
+                            source=source_id,
+                            points=points,
                         )
-                    set_asset_preference(s, sym, src.id())
-                total += len(points)
-                success = True
-                break
-            if not success:
-                msg = f"Failed to sync {sym} from all providers"
-                if last_err:
-                    msg += f": last error: {last_err}"
-                raise RuntimeError(msg)
-            _time.sleep(0.25)  # be gentle with rate limits
+                        set_asset_preference(s, sym, source_id)
+                except Exception as e:
+                    failures.append(f"Failed to store prices for {sym}: {e}")
+                    continue
+                total += written
     except Exception as e:
         typer.echo(f"Error during price sync: {e}")
         raise typer.Exit(code=1)
+    if failures:
+        # One write for the whole report rather than an echo/flush per symbol
+        typer.echo("\n".join(f"Error during price sync: {msg}" for msg in failures))
+        raise typer.Exit(code=1)
     typer.echo(f"Inserted/updated {total} price points across {len(symbols)} assets.")
 
 
@@ -253,44 +348,31 @@ def price_quote(
 ) -> None:
     """Fetch and display the latest quote using provider fallback order."""
     import wealth_os.datasources  # noqa
-    from wealth_os.datasources.registry import get_price_sources
+    from wealth_os.datasources.cache import quote_cache
+    from wealth_os.datasources.registry import get_price_source, get_price_sources
+    from .db.repo import session_scope, get_asset_preference, set_asset_preference
 
     cfg = get_config()
     ctx = load_context()
     quote = quote or ctx.quote or cfg.base_currency
     all_sources = get_price_sources()
-    default_order = [
-        s.strip()
-        for s in (
-            ctx.providers
-            or os.getenv("WEALTH_PRICE_PROVIDER_ORDER", "coinmarketcap,coindesk")
-        ).split(",")
-        if s.strip()
-    ]
-    cli_order = [s.strip() for s in providers.split(",")] if providers else None
-    base_order = cli_order or default_order
+    base_order = _base_provider_order(providers, ctx.providers)
     sym = asset.strip().upper()
     with session_scope(cfg.db_path) as s:
         preferred = get_asset_preference(s, sym)
-    order = []
-    if preferred:
-        order.append(preferred)
-    for name in base_order:
-        if name not in order:
-            order.append(name)
+    order = _provider_order(preferred, base_order, all_sources)
 
     last_err = None
     for prov_name in order:
-        if prov_name not in all_sources:
-            continue
         try:
-            src_cls = all_sources[prov_name]
-            src = src_cls()  # type: ignore[call-arg]
-            q = src.get_quote(sym, quote)
+            src = get_price_source(prov_name)
+            q = quote_cache.get_or_compute(
+                (src.id(), sym, quote.upper()), lambda: src.get_quote(sym, quote)
+            )
         except Exception as e:
             last_err = e
             continue
-        with session_scope(cfg.db_path) as s:
+        with session_scope(cfg.db_path, write=True) as s:
             set_asset_preference(s, sym, src.id())
         typer.echo(
             f"{q.symbol}/{q.quote_ccy} price={q.price} ts={q.ts.isoformat()} (via {src.id()})"
@@ -314,39 +396,45 @@ def price_show(
     limit: int = typer.Option(20, "--limit", help="Limit number of rows"),
 ) -> None:
     """Show cached prices from the local DB."""
+    from .db.repo import session_scope, iter_prices
+
     cfg = get_config()
     ctx = load_context()
     quote = quote or ctx.quote or cfg.base_currency
+    table = Table(title=f"Prices for {asset}/{quote}")
+    table.add_column("Timestamp")
+    table.add_column("Close", justify="right")
+    # Rows are streamed from the cursor straight into the table
     with session_scope(cfg.db_path) as s:
-        rows = list_prices(
+        for r in iter_prices(
             s, asset_symbol=asset, quote_ccy=quote, since=since, limit=limit
-        )
-    if not rows:
+        ):
+            table.add_row(r.ts.isoformat(), str(r.price))
+    if not table.row_count:
         typer.echo("No prices found.")
         raise typer.Exit(code=0)
-    table = Table(title=f"Prices for {asset}/{quote}")
-    table.add_column("Timestamp")
-    table.add_column("Close", justify="right")
-    for r in rows:
-        table.add_row(r.ts.isoformat(), str(r.price))
     console.print(table)
 
 
 app.add_typer(price_app, name="price")
 
-# Domain subcommands registered below
-
-app.add_typer(account_app, name="account")
-app.add_typer(tx_app, name="tx")
-app.add_typer(import_app, name="import")
-app.add_typer(export_app, name="export")
-app.add_typer(chart_app, name="chart")
-app.add_typer(report_app, name="report")
-app.add_typer(context_app, name="context")
-
 
 portfolio_app = typer.Typer(help="Portfolio views")
 
+_TOTALS_TEMPLATE = (
+    "[bold]Totals[/bold]\nValue: %s\nCost Open: %s\nUnrealized: %s\nRealized: %s"
+)
+_TOTALS_KEYS = ("value", "cost_open", "unrealized", "realized")
+_POSITION_COLUMNS = (
+    ("Asset", "left"),
+    ("Qty", "right"),
+    ("Price", "right"),
+    ("Value", "right"),
+    ("Cost Open", "right"),
+    ("Unrealized", "right"),
+    ("Realized", "right"),
+)
+
 
 @portfolio_app.command("summary")
 def portfolio_summary(
@@ -362,6 +450,9 @@ def portfolio_summary(
         None, "--account-id", help="Limit to a single account"
     ),
 ) -> None:
+    from .core.valuation import summarize_portfolio
+    from .db.repo import session_scope
+
     cfg = get_config()
     ctx = load_context()
     as_of = as_of or datetime.utcnow()
@@ -373,39 +464,29 @@ def portfolio_summary(
     if not positions:
         console.print("[yellow]No holdings as of the specified time.[/yellow]")
         raise typer.Exit(code=0)
-    console.print(
-        Panel.fit(
-            f"Portfolio summary as of {as_of.isoformat()} in {quote}",
-            border_style="cyan",
-        )
+    header = Panel.fit(
+        f"Portfolio summary as of {as_of.isoformat()} in {quote}",
+        border_style="cyan",
     )
     table = Table(title="Positions")
-    table.add_column("Asset")
-    table.add_column("Qty", justify="right")
-    table.add_column("Price", justify="right")
-    table.add_column("Value", justify="right")
-    table.add_column("Cost Open", justify="right")
-    table.add_column("Unrealized", justify="right")
-    table.add_column("Realized", justify="right")
+    for name, justify in _POSITION_COLUMNS:
+        table.add_column(name, justify=justify)
     for p in positions:
-        price_s = fmt_money(p.price) if p.price is not None else "-"
-        value_s = fmt_money(p.value) if p.value is not None else "-"
-        cost_s = fmt_money(p.cost_open) if p.cost_open is not None else "-"
         table.add_row(
             p.asset,
             fmt_decimal(p.qty),
-            price_s,
-            value_s,
-            cost_s,
+            fmt_money(p.price, "-"),
+            fmt_money(p.value, "-"),
+            fmt_money(p.cost_open, "-"),
             colorize_pnl(p.unrealized_pnl),
             colorize_pnl(p.realized_pnl),
         )
-    console.print(table)
     totals_panel = Panel(
-        f"[bold]Totals[/bold]\nValue: {fmt_money(totals['value'])}\nCost Open: {fmt_money(totals['cost_open'])}\nUnrealized: {fmt_money(totals['unrealized'])}\nRealized: {fmt_money(totals['realized'])}",
+        _TOTALS_TEMPLATE % tuple(fmt_money(totals[k]) for k in _TOTALS_KEYS),
         border_style="magenta",
     )
-    console.print(totals_panel)
+    # Render everything in one pass: a single write/flush to the terminal
+    console.print(header, table, totals_panel)
 
 
 app.add_typer(portfolio_app, name="portfolio")
@@ -430,24 +511,24 @@ def portfolio_chart(
 ) -> None:
     """Render a terminal line chart of portfolio value over time."""
     import plotext as plt
-    from wealth_os.core.valuation import summarize_portfolio
+    from wealth_os.core.valuation import portfolio_value_series
+    from wealth_os.db.repo import session_scope
     from datetime import timedelta
 
     cfg = get_config()
     ctx = load_context()
     quote = quote or ctx.quote or cfg.base_currency
     until = until or datetime.utcnow()
-    xs = []
-    ys = []
+    points = []
+    cur = since
+    while cur <= until:
+        points.append(cur)
+        cur = cur + timedelta(days=1)
     with session_scope(cfg.db_path) as s:
-        cur = since
-        while cur <= until:
-            positions, totals = summarize_portfolio(
-                s, as_of=cur, quote=quote, account_id=account_id
-            )
-            xs.append(cur.strftime("%Y-%m-%d"))
-            ys.append(float(totals["value"]))
-            cur = cur + timedelta(days=1)
+        ys = portfolio_value_series(
+            s, points=points, quote=quote, account_id=account_id
+        )
+    xs = [p.strftime("%Y-%m-%d") for p in points]
     if not ys:
         console.print("[yellow]No data available for the requested range.[/yellow]")
         raise typer.Exit(code=0)
@@ -478,13 +559,29 @@ def seed(
     """Initialize the DB with mock accounts, transactions, and optional synthetic prices."""
     from decimal import Decimal
     from datetime import timedelta
+    from types import SimpleNamespace
     import math
 
+    from .core.valuation import refresh_position_snapshots
+    from .db.engine import get_engine, init_db
+    from .db.models import AccountType, TxSide
+    from .db.repo import (
+        session_scope,
+        upsert_prices_bulk,
+        create_account,
+        list_accounts,
+        create_transaction,
+    )
+
     cfg = get_config()
     db_path = cfg.db_path
     # Optional reset (dangerous)
     if reset and os.path.exists(db_path):
+        # Drop pooled connections to the old file before deleting it
+        get_engine(db_path).dispose()
         os.remove(db_path)
+        # The schema check is memoized per path; the new file needs it again
+        init_db.cache_clear()
     init_db(db_path)
 
     # Skip if already seeded (unless reset)
@@ -497,7 +594,7 @@ def seed(
             raise typer.Exit(code=0)
 
     # Create sample accounts
-    with session_scope(db_path) as s:
+    with session_scope(db_path, write=True) as s:
         acc1 = create_account(
             s,
             name="Main Exchange",
@@ -521,7 +618,7 @@ def seed(
         return now - timedelta(days=d)
 
     # Create sample transactions
-    with session_scope(db_path) as s:
+    with session_scope(db_path, write=True) as s:
         # BTC buys on Main Exchange
         create_transaction(
             s,
@@ -602,32 +699,30 @@ def seed(
             total_quote=Decimal("1750"),
             quote_ccy=quote,
         )
+        refresh_position_snapshots(s)
 
     # Seed synthetic daily prices
     if with_prices:
         start = now - timedelta(days=days)
-        with session_scope(db_path) as s:
-            for i in range(days + 1):
-                ts = start + timedelta(days=i)
-                # BTC synthetic
-                btc = Decimal(str(60000 + 5000 * math.sin(i / 14.0)))
-                upsert_price(
-                    s,
-                    asset_symbol="BTC",
-                    quote_ccy=quote,
-                    ts=ts,
-                    price=btc,
-                    source="seed",
-                )
-                # ETH synthetic
-                eth = Decimal(str(3000 + 400 * math.sin(i / 10.0)))
-                upsert_price(
+        # Synthetic daily curves, written per asset with the bulk upsert
+        curves = {
+            "BTC": lambda i: 60000 + 5000 * math.sin(i / 14.0),
+            "ETH": lambda i: 3000 + 400 * math.sin(i / 10.0),
+        }
+        with session_scope(db_path, write=True) as s:
+            for sym, curve in curves.items():
+                upsert_prices_bulk(
                     s,
-                    asset_symbol="ETH",
+                    asset_symbol=sym,
                     quote_ccy=quote,
-                    ts=ts,
-                    price=eth,
                     source="seed",
+                    points=(
+                        SimpleNamespace(
+                            ts=start + timedelta(days=i),
+                            close=Decimal(str(curve(i))),
+                        )
+                        for i in range(days + 1)
+                    ),
                 )
 
     console.print(
@@ -643,6 +738,9 @@ def run_api(
     port: int = typer.Option(8001, "--port"),
     host: str = typer.Option("127.0.0.1", "--host"),
 ) -> None:
+    from uvicorn import Config as UvicornConfig, Server as UvicornServer
+    from .db.engine import init_db
+
     cfg = get_config()
     init_db(cfg.db_path)
     from wealth_os.api.server import app as fastapi_app
@@ -679,6 +777,14 @@ def run_ui(
     By default this starts the UI in production mode (next start). Use --dev to run the dev server.
     If --build is provided (or no build exists), the UI will be built before starting.
     """
+    import shutil
+    import subprocess
+    import threading
+    import time as _time
+
+    from uvicorn import Config as UvicornConfig, Server as UvicornServer
+    from .db.engine import init_db
+
     cfg = get_config()
     init_db(cfg.db_path)
 
@@ -688,10 +794,14 @@ def run_ui(
         UvicornConfig(fastapi_app, host=api_host, port=api_port, log_level="info")
     )
 
-    # Start backend in a separate thread
+    # Start backend in a separate thread and wait until it is actually serving
     t = threading.Thread(target=server.run, daemon=True)
     t.start()
-    _time.sleep(0.5)
+    while not server.started and t.is_alive():
+        _time.sleep(0.05)
+    if not t.is_alive():
+        console.print("[red]API server failed to start.[/red]")
+        raise typer.Exit(code=1)
     console.print(
         Panel.fit(
             f"API running at http://{api_host}:{api_port} (docs at /docs)",
@@ -710,19 +820,21 @@ def run_ui(
         ui_path = str(resolved)
 
     # Start Next.js UI
-    env = dict(**os.environ)
-    env["NEXT_PUBLIC_API_BASE"] = f"http://{api_host}:{api_port}"
+    env = child_env({"NEXT_PUBLIC_API_BASE": f"http://{api_host}:{api_port}"})
+
+    # npm is resolved once and run directly (no intermediate shell)
+    npm = shutil.which("npm")
 
     if dev:
         ui_cmd = "npm run dev"
-        if not shutil.which(ui_cmd.split()[0]):
+        if npm is None:
             console.print("[yellow]Note: npm not found. Run the UI manually.[/yellow]")
             console.print(f"cd {ui_path} && {ui_cmd}")
             console.print("Backend API remains running above.")
             t.join()
             return
         try:
-            proc = subprocess.Popen(ui_cmd, cwd=ui_path, shell=True, env=env)
+            proc = subprocess.Popen([npm, "run", "dev"], cwd=ui_path, env=env)
             console.print(
                 Panel.fit(
                     f"UI starting in DEV with {ui_cmd} in {ui_path}. NEXT_PUBLIC_API_BASE={env['NEXT_PUBLIC_API_BASE']}",
@@ -752,7 +864,7 @@ def run_ui(
                     "Provide --ui-path pointing to the Next.js project (e.g. cloned repo src/wealth/ui)."
                 )
                 raise typer.Exit(code=1)
-            if shutil.which("npm") is None:
+            if npm is None:
                 console.print(
                     "[red]npm not found in PATH.[/red] Install Node.js or run the UI manually."
                 )
@@ -762,10 +874,8 @@ def run_ui(
                 console.print("Backend API remains running above.")
                 t.join()
                 return
-            subprocess.check_call(
-                "npm install --silent", cwd=ui_path, shell=True, env=env
-            )
-            subprocess.check_call("npm run build", cwd=ui_path, shell=True, env=env)
+            subprocess.check_call([npm, "install", "--silent"], cwd=ui_path, env=env)
+            subprocess.check_call([npm, "run", "build"], cwd=ui_path, env=env)
         except subprocess.CalledProcessError as e:
             console.print(f"[red]UI build failed:[/red] {e}")
             raise typer.Exit(code=1)
@@ -774,14 +884,14 @@ def run_ui(
     env["PORT"] = str(ui_port)
     env["HOST"] = env.get("HOST", "0.0.0.0")
     ui_cmd = "npm run start"
-    if not shutil.which(ui_cmd.split()[0]):
+    if npm is None:
         console.print("[yellow]Note: npm not found. Run the UI manually.[/yellow]")
         console.print(f"cd {ui_path} && {ui_cmd}")
         console.print("Backend API remains running above.")
         t.join()
         return
     try:
-        proc = subprocess.Popen(ui_cmd, cwd=ui_path, shell=True, env=env)
+        proc = subprocess.Popen([npm, "run", "start"], cwd=ui_path, env=env)
         console.print(
             Panel.fit(
                 f"UI starting in PROD with {ui_cmd} on port {ui_port}. NEXT_PUBLIC_API_BASE={env['NEXT_PUBLIC_API_BASE']}",
@@ -793,3 +903,10 @@ def run_ui(
         pass
     finally:
         console.print("[yellow]Shutting down...[/yellow]")
+
+
+def __getattr__(name: str):
+    # `wealth_os.CONFIG` stays importable without loading .env at import time
+    if name == "CONFIG":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
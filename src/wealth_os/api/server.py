@@ -1,15 +1,27 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from decimal import Decimal
+from functools import lru_cache
+import logging
 from typing import List, Optional
 
-from fastapi import FastAPI, HTTPException, Query, UploadFile, File, Form, Response
+from fastapi import (
+    BackgroundTasks,
+    FastAPI,
+    HTTPException,
+    Query,
+    UploadFile,
+    File,
+    Form,
+    Response,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
 from wealth_os.core.config import get_config
-from wealth_os.core.context import load_context, save_context
+from wealth_os.core.context import get_context_path, load_context, save_context
 from wealth_os.db.repo import (
     session_scope,
     list_accounts,
@@ -17,16 +29,27 @@ from wealth_os.db.repo import (
     update_account,
     delete_account,
     list_transactions,
+    get_transaction,
     create_transaction,
     update_transaction,
     delete_transaction,
     get_asset_preference,
+    get_asset_preferences,
     set_asset_preference,
     upsert_price,
+    upsert_price_rows,
+    upsert_prices_bulk,
     get_last_price,
+    get_last_prices,
 )
 from wealth_os.db.models import AccountType, TxSide
-from wealth_os.core.valuation import summarize_portfolio, compute_holdings
+from wealth_os.core.valuation import (
+    current_holdings,
+    portfolio_timeline,
+    portfolio_value_series,
+    refresh_position_snapshots,
+    summarize_portfolio,
+)
 from sqlmodel import select
 from sqlalchemy import func
 from wealth_os.db import models as dbm
@@ -34,8 +57,15 @@ import os
 
 # Ensure providers are registered
 import wealth_os.datasources  # noqa: F401
-from wealth_os.datasources.registry import get_price_sources
+from wealth_os.datasources.registry import (
+    DEFAULT_PROVIDER_ORDER,
+    get_price_source,
+    get_price_source_names,
+    get_price_sources,
+    parse_provider_order,
+)
 from wealth_os.datasources.base import PriceQuote as DSPriceQuote
+from wealth_os.datasources.cache import quote_cache
 
 
 app = FastAPI(title="Wealth API", version="0.1.0")
@@ -46,6 +76,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -58,6 +89,9 @@ class AccountIn(BaseModel):
 
 
 class AccountOut(AccountIn):
+    # Built straight from ORM rows via model_validate
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     created_at: datetime
 
@@ -82,11 +116,28 @@ class TxIn(BaseModel):
 
 
 class TxOut(TxIn):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
 
 
+def _session(write: bool = False):
+    """Session on the configured database for one request.
+
+    ``get_config`` and the per-path sessionmaker are both cached, so this is
+    two cache hits; tests can still repoint the DB via ``get_config.cache_clear``.
+    Handlers that write pass ``write=True`` to begin with ``BEGIN IMMEDIATE``.
+    """
+    return session_scope(get_config().db_path, write=write)
+
+
+# Handlers that touch SQLite or provider HTTP stay plain `def`: FastAPI runs
+# them in its worker threadpool, so they never block the event loop. Only
+# handlers that do no I/O are `async def` and skip the threadpool hop.
+
+
 @app.get("/health")
-def health():
+async def health():
     return {"status": "ok"}
 
 
@@ -98,63 +149,184 @@ class QuoteOut(BaseModel):
     source: str
 
 
-def _provider_order(preferred: str | None = None) -> list[str]:
+def _daily_points(start: datetime, end: datetime) -> list[datetime]:
+    """``start``, ``start + 1d``, ... up to and including ``end``."""
+    from datetime import timedelta
+
+    points: list[datetime] = []
+    cur = start
+    while cur <= end:
+        points.append(cur)
+        cur += timedelta(days=1)
+    return points
+
+
+@lru_cache(maxsize=4)
+def _base_order_for(ctx_mtime_ns: int | None, env_order: str | None) -> tuple[str, ...]:
     # Context override > env var
     ctx = load_context()
-    default = ctx.providers or os.getenv(
-        "WEALTH_PRICE_PROVIDER_ORDER", "coinmarketcap,coindesk"
-    )
-    base = [s.strip() for s in default.split(",") if s.strip()]
-    out: list[str] = []
-    if preferred and preferred not in out:
-        out.append(preferred)
-    for name in base:
-        if name not in out:
-            out.append(name)
-    return out
+    return parse_provider_order(ctx.providers or env_order or DEFAULT_PROVIDER_ORDER)
 
 
-def _latest_quote(
-    session, symbol: str, quote: str, first_provider: str | None = None
-) -> QuoteOut | None:
-    sources = get_price_sources()
-    # If a provider was explicitly requested, try it first; otherwise use stored preference
-    pref = first_provider or get_asset_preference(session, symbol)
-    order = _provider_order(pref)
-    # Try providers in order until one returns a quote
+def _base_order() -> tuple[str, ...]:
+    """Configured provider order, re-parsed only when its inputs change.
+
+    Keyed on the context file's mtime (it can be edited via `PUT /context` or
+    the CLI) and the env var, so a lookup costs one stat() instead of
+    reading and parsing the context JSON.
+    """
+    try:
+        mtime: int | None = get_context_path().stat().st_mtime_ns
+    except OSError:
+        mtime = None
+    return _base_order_for(mtime, os.getenv("WEALTH_PRICE_PROVIDER_ORDER"))
+
+
+@lru_cache(maxsize=64)
+def _build_chain(
+    order: tuple[str, ...], registered: tuple[str, ...]
+) -> tuple[str, ...]:
+    """``order`` de-duplicated and limited to ``registered`` providers.
+
+    ``registered`` is ``get_price_source_names()``, which changes when a
+    provider registers, so new providers produce a new cache entry.
+    """
+    known = frozenset(registered)
+    return tuple(name for name in dict.fromkeys(order) if name in known)
+
+
+def _provider_order(preferred: str | None = None) -> tuple[str, ...]:
+    """Providers to try, ``preferred`` first, as a cached ready-to-use chain."""
+    base = _base_order()
+    order = (preferred, *base) if preferred else base
+    return _build_chain(order, get_price_source_names())
+
+
+# Upper bound on concurrent provider calls when refreshing portfolio quotes
+_QUOTE_WORKERS = 8
+# A stored price younger than this is served as the latest quote
+_QUOTE_MAX_AGE_SECONDS = 300
+
+
+def _stored_quote(
+    session, sym: str, qccy: str, order: tuple[str, ...]
+) -> tuple[DSPriceQuote, str] | None:
+    """Latest persisted price if it is fresh and from one of ``order``'s providers."""
+    row = get_last_price(session, asset_symbol=sym, quote_ccy=qccy, provider=order[0])
+    if row is None or row.source not in order:
+        return None
+    if (datetime.utcnow() - row.ts).total_seconds() > _QUOTE_MAX_AGE_SECONDS:
+        return None
+    q = DSPriceQuote(symbol=sym, quote_ccy=qccy, price=row.price, ts=row.ts)
+    return q, row.source
+
+
+def _fetch_quote(
+    symbol: str,
+    quote: str,
+    preferred: str | None = None,
+    *,
+    refresh: bool = False,
+    session=None,
+) -> tuple[DSPriceQuote, str, bool] | None:
+    """Resolve the latest quote for one symbol through the cache levels.
+
+    Returns ``(quote, source_id, fetched)`` or None if every provider failed.
+    Lookup order: the in-process ``quote_cache``, then (when a ``session`` is
+    given) a fresh row in the price table, then the providers in order.
+    ``fetched`` is True only for a new provider quote that should be
+    persisted; ``refresh`` skips both cache levels.
+    """
+    order = _provider_order(preferred)
     sym = symbol.upper()
     qccy = (quote or "USD").upper()
+    if not order:
+        return None
+    if not refresh:
+        for name in order:
+            q: DSPriceQuote | None = quote_cache.get((name, sym, qccy))
+            if q is not None:
+                return q, name, False
+        if session is not None:
+            stored = _stored_quote(session, sym, qccy, order)
+            if stored is not None:
+                quote_cache.set((stored[1], sym, qccy), stored[0])
+                return stored[0], stored[1], False
+    # Try providers in order until one returns a quote
     for name in order:
-        if name not in sources:
-            continue
         try:
-            cls = sources[name]
-            src = cls()  # type: ignore[call-arg]
-            q: DSPriceQuote = src.get_quote(sym, qccy)
-            set_asset_preference(session, sym, src.id())
-            # cache the quote as last price for portfolio views
-            upsert_price(
-                session,
-                asset_symbol=sym,
-                quote_ccy=q.quote_ccy,
-                ts=q.ts,
-                price=q.price,
-                source=src.id(),
-            )
-            return QuoteOut(
-                symbol=q.symbol,
-                quote_ccy=q.quote_ccy,
-                price=q.price,
-                ts=q.ts,
-                source=src.id(),
-            )
+            # Shared per-provider instance, so its HTTP pool is reused
+            src = get_price_source(name)
+            if src is None:
+                continue
+            q = src.get_quote(sym, qccy)
+            quote_cache.set((src.id(), sym, qccy), q)
+            return q, src.id(), True
         except Exception:  # pragma: no cover - network errors
             continue
     return None
 
 
-def _ensure_daily_prices(
+def _store_quote(session, symbol: str, q: DSPriceQuote, source_id: str) -> None:
+    sym = symbol.upper()
+    set_asset_preference(session, sym, source_id)
+    # cache the quote as last price for portfolio views
+    upsert_price(
+        session,
+        asset_symbol=sym,
+        quote_ccy=q.quote_ccy,
+        ts=q.ts,
+        price=q.price,
+        source=source_id,
+    )
+
+
+def _persist_quote(symbol: str, q: DSPriceQuote, source_id: str) -> None:
+    # Runs after the response is sent, so nothing would surface an error here
+    try:
+        with _session(write=True) as s:
+            _store_quote(s, symbol, q, source_id)
+    except Exception:
+        logging.getLogger(__name__).exception(
+            "Failed to persist %s quote from %s", symbol, source_id
+        )
+
+
+def _latest_quote(
     session,
+    symbol: str,
+    quote: str,
+    first_provider: str | None = None,
+    *,
+    refresh: bool = False,
+    background: BackgroundTasks | None = None,
+) -> QuoteOut | None:
+    """Latest quote for ``symbol``; a newly fetched one is also persisted.
+
+    With ``background``, the write runs in its own session after the response
+    is sent instead of delaying it (the quote is already in ``quote_cache``).
+    """
+    # If a provider was explicitly requested, try it first; otherwise use stored preference
+    pref = first_provider or get_asset_preference(session, symbol)
+    hit = _fetch_quote(symbol, quote, pref, refresh=refresh, session=session)
+    if hit is None:
+        return None
+    q, source_id, fetched = hit
+    if fetched:
+        if background is not None:
+            background.add_task(_persist_quote, symbol, q, source_id)
+        else:
+            _store_quote(session, symbol, q, source_id)
+    return QuoteOut(
+        symbol=q.symbol,
+        quote_ccy=q.quote_ccy,
+        price=q.price,
+        ts=q.ts,
+        source=source_id,
+    )
+
+
+def _ensure_daily_prices(
     symbol: str,
     quote: str,
     start: datetime,
@@ -164,8 +336,9 @@ def _ensure_daily_prices(
     """Best-effort: fetch and cache daily OHLCV for [start, end] if price table lacks coverage.
 
     This avoids zero valuations in time-series when only a recent quote exists.
+    Provider calls run with no transaction open; only the finished rows are
+    written, in a short ``write=True`` session.
     """
-    sources = get_price_sources()
     order = _provider_order(preferred)
     sym = symbol.upper()
     qccy = (quote or "USD").upper()
@@ -173,43 +346,55 @@ def _ensure_daily_prices(
     from sqlmodel import select
     from wealth_os.db.models import Price
 
-    have = session.exec(
-        select(Price)
-        .where(
-            (Price.asset_symbol == sym)
-            & (Price.quote_ccy == qccy)
-            & (Price.ts >= start)
-            & (Price.ts <= end)
-        )
-        .limit(1)
-    ).first()
+    with _session() as s:
+        have = s.exec(
+            select(Price.id)
+            .where(
+                (Price.asset_symbol == sym)
+                & (Price.quote_ccy == qccy)
+                & (Price.ts >= start)
+                & (Price.ts <= end)
+            )
+            .limit(1)
+        ).first()
     if have:
         return
     for name in order:
-        if name not in sources:
-            continue
         try:
-            cls = sources[name]
-            src = cls()  # type: ignore[call-arg]
-            points = src.get_ohlcv(sym, start=start, end=end, interval="1d", quote=qccy)
-            if not points:
+            src = get_price_source(name)
+            if src is None:
                 continue
-            for p in points:
-                upsert_price(
-                    session,
-                    asset_symbol=sym,
-                    quote_ccy=qccy,
-                    ts=p.ts,
-                    price=p.close,
-                    source=src.id(),
-                )
-            set_asset_preference(session, sym, src.id())
-            return
+            points = list(
+                src.get_ohlcv(sym, start=start, end=end, interval="1d", quote=qccy)
+            )
         except Exception:  # pragma: no cover - network/env errors
             continue
+        if not points:
+            continue
+        with _session(write=True) as s:
+            upsert_prices_bulk(
+                s, asset_symbol=sym, quote_ccy=qccy, source=src.id(), points=points
+            )
+            set_asset_preference(s, sym, src.id())
+        return
     # If we reach here, we couldn't fetch — silently continue so the series uses what exists
 
 
+_ACCOUNTS_JSON = TypeAdapter(List[AccountOut])
+_TXS_JSON = TypeAdapter(List[TxOut])
+
+
+def _json_response(adapter: TypeAdapter, data) -> Response:
+    """Validate ``data`` from attributes and serialize it in one pydantic-core pass.
+
+    Returning a ``Response`` skips FastAPI's second response-model validation
+    and its JSON encoder; ``response_model`` on the route still documents the
+    schema. Output matches what FastAPI would have produced.
+    """
+    value = adapter.validate_python(data, from_attributes=True)
+    return Response(adapter.dump_json(value), media_type="application/json")
+
+
 @app.get("/accounts", response_model=List[AccountOut])
 def api_list_accounts(
     name_like: Optional[str] = None,
@@ -217,18 +402,16 @@ def api_list_accounts(
     limit: int = 100,
     offset: int = 0,
 ):
-    cfg = get_config()
-    with session_scope(cfg.db_path) as s:
+    with _session() as s:
         rows = list_accounts(
             s, name_like=name_like, datasource=datasource, limit=limit, offset=offset
         )
-        return [AccountOut(**row.dict()) for row in rows]
+        return _json_response(_ACCOUNTS_JSON, rows)
 
 
 @app.post("/accounts", response_model=AccountOut)
 def api_create_account(body: AccountIn):
-    cfg = get_config()
-    with session_scope(cfg.db_path) as s:
+    with _session(write=True) as s:
         row = create_account(
             s,
             name=body.name,
@@ -237,13 +420,12 @@ def api_create_account(body: AccountIn):
             external_id=body.external_id,
             currency=body.currency,
         )
-        return AccountOut(**row.dict())
+        return AccountOut.model_validate(row)
 
 
 @app.put("/accounts/{account_id}", response_model=AccountOut)
 def api_update_account(account_id: int, body: AccountIn):
-    cfg = get_config()
-    with session_scope(cfg.db_path) as s:
+    with _session(write=True) as s:
         row = update_account(
             s,
             account_id,
@@ -255,13 +437,12 @@ def api_update_account(account_id: int, body: AccountIn):
         )
         if not row:
             raise HTTPException(status_code=404, detail="Account not found")
-        return AccountOut(**row.dict())
+        return AccountOut.model_validate(row)
 
 
 @app.delete("/accounts/{account_id}")
 def api_delete_account(account_id: int):
-    cfg = get_config()
-    with session_scope(cfg.db_path) as s:
+    with _session(write=True) as s:
         ok = delete_account(s, account_id)
         if not ok:
             raise HTTPException(status_code=404, detail="Account not found")
@@ -277,9 +458,14 @@ def api_list_transactions(
     until: Optional[datetime] = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[int] = Query(
+        None, description="Id of the last transaction on the previous page"
+    ),
 ):
-    cfg = get_config()
-    with session_scope(cfg.db_path) as s:
+    with _session() as s:
+        # An unknown (e.g. deleted) cursor has no position to resume from
+        if cursor is not None and get_transaction(s, cursor) is None:
+            raise HTTPException(status_code=400, detail="Unknown cursor")
         rows = list_transactions(
             s,
             account_id=account_id,
@@ -289,24 +475,32 @@ def api_list_transactions(
             until=until,
             limit=limit,
             offset=offset,
+            before_id=cursor,
         )
-        return [TxOut(**row.dict()) for row in rows]
+        resp = _json_response(_TXS_JSON, rows)
+    # Keyset pagination: pass this back as `cursor` for the next page
+    if rows and len(rows) == limit:
+        resp.headers["X-Next-Cursor"] = str(rows[-1].id)
+    return resp
 
 
 @app.post("/transactions", response_model=TxOut)
-def api_create_tx(body: TxIn):
-    cfg = get_config()
-    with session_scope(cfg.db_path) as s:
+def api_create_tx(body: TxIn, background: BackgroundTasks):
+    with _session(write=True) as s:
         # Auto-fill price for buy/sell when only qty provided
         eff_price = body.price_quote
         if eff_price is None and body.side in (TxSide.buy, TxSide.sell):
             # If datasource matches a known provider, prefer it for this request
             req_provider = (
-                body.datasource
-                if body.datasource in get_price_sources().keys()
-                else None
+                body.datasource if body.datasource in get_price_sources() else None
+            )
+            q = _latest_quote(
+                s,
+                body.asset_symbol,
+                body.quote_ccy,
+                req_provider,
+                background=background,
             )
-            q = _latest_quote(s, body.asset_symbol, body.quote_ccy, req_provider)
             if q is not None:
                 eff_price = q.price
                 # ensure quote ccy aligns
@@ -330,21 +524,25 @@ def api_create_tx(body: TxIn):
             import_batch_id=body.import_batch_id,
             tags=body.tags,
         )
-        return TxOut(**row.dict())
+        refresh_position_snapshots(s)
+        return TxOut.model_validate(row)
 
 
 @app.put("/transactions/{tx_id}", response_model=TxOut)
-def api_update_tx(tx_id: int, body: TxIn):
-    cfg = get_config()
-    with session_scope(cfg.db_path) as s:
+def api_update_tx(tx_id: int, body: TxIn, background: BackgroundTasks):
+    with _session(write=True) as s:
         eff_price = body.price_quote
         if eff_price is None and body.side in (TxSide.buy, TxSide.sell):
             req_provider = (
-                body.datasource
-                if body.datasource in get_price_sources().keys()
-                else None
+                body.datasource if body.datasource in get_price_sources() else None
+            )
+            q = _latest_quote(
+                s,
+                body.asset_symbol,
+                body.quote_ccy,
+                req_provider,
+                background=background,
             )
-            q = _latest_quote(s, body.asset_symbol, body.quote_ccy, req_provider)
             if q is not None:
                 eff_price = q.price
                 body.quote_ccy = q.quote_ccy
@@ -370,20 +568,23 @@ def api_update_tx(tx_id: int, body: TxIn):
         )
         if not row:
             raise HTTPException(status_code=404, detail="Transaction not found")
-        return TxOut(**row.dict())
+        refresh_position_snapshots(s)
+        return TxOut.model_validate(row)
 
 
 @app.delete("/transactions/{tx_id}")
 def api_delete_tx(tx_id: int):
-    cfg = get_config()
-    with session_scope(cfg.db_path) as s:
+    with _session(write=True) as s:
         ok = delete_transaction(s, tx_id)
         if not ok:
             raise HTTPException(status_code=404, detail="Transaction not found")
+        refresh_position_snapshots(s)
     return {"ok": True}
 
 
 class PositionOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     asset: str
     qty: Decimal
     price: Optional[Decimal] = None
@@ -406,46 +607,81 @@ class PortfolioSummary(BaseModel):
     totals: TotalsOut
 
 
+_SUMMARY_JSON = TypeAdapter(PortfolioSummary)
+
+
 @app.get("/portfolio/summary", response_model=PortfolioSummary)
 def api_portfolio_summary(quote: str = "USD", account_id: Optional[int] = None):
-    cfg = get_config()
-    with session_scope(cfg.db_path) as s:
-        # Best-effort: ensure fresh latest quotes for held assets to make KPIs "live"
-        now = datetime.utcnow()
-        try:
-            holds = compute_holdings(s, as_of=now, account_id=account_id)
+    # Best-effort: ensure fresh latest quotes for held assets to make KPIs "live"
+    now = datetime.utcnow()
+    try:
+        with _session() as s:
+            holds = current_holdings(s, as_of=now, account_id=account_id)
+            last = get_last_prices(s, asset_symbols=holds.keys(), quote_ccy=quote)
+            stale = []
             for sym in holds.keys():
-                row = get_last_price(s, asset_symbol=sym, quote_ccy=quote)
+                row = last.get(sym.upper())
                 # Fetch if missing or older than 5 minutes
-                if row is None or (now - row.ts).total_seconds() > 300:
-                    _latest_quote(s, sym, quote)
-        except Exception:
-            # Non-fatal; proceed with whatever cached prices exist
-            pass
+                age = None if row is None else (now - row.ts).total_seconds()
+                if age is None or age > _QUOTE_MAX_AGE_SECONDS:
+                    stale.append(sym)
+            prefs = get_asset_preferences(s, stale)
+        if stale:
+            # Provider calls overlap on worker threads with no transaction
+            # open, so a slow provider never holds the SQLite write lock
+            workers = min(len(stale), _QUOTE_WORKERS)
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                hits = ex.map(
+                    lambda sym: _fetch_quote(sym, quote, prefs[sym.upper()]),
+                    stale,
+                )
+                fresh = [
+                    (sym.upper(), hit[0], hit[1])
+                    for sym, hit in zip(stale, hits)
+                    if hit is not None and hit[2]
+                ]
+            if fresh:
+                # One short write: a multi-row upsert for every refreshed quote
+                with _session(write=True) as s:
+                    upsert_price_rows(
+                        s,
+                        (
+                            {
+                                "asset_symbol": sym,
+                                "quote_ccy": q.quote_ccy,
+                                "ts": q.ts,
+                                "price": q.price,
+                                "source": source_id,
+                            }
+                            for sym, q, source_id in fresh
+                        ),
+                    )
+                    for sym, _q, source_id in fresh:
+                        if prefs.get(sym) != source_id:
+                            set_asset_preference(s, sym, source_id)
+    except Exception:
+        # Non-fatal; proceed with whatever cached prices exist
+        pass
+    with _session() as s:
+        # Value as of after the refresh: quotes stamped "now" by the provider
+        # are newer than the start of this request
         positions, totals = summarize_portfolio(
-            s, as_of=now, quote=quote, account_id=account_id
+            s, as_of=datetime.utcnow(), quote=quote, account_id=account_id
         )
-        pos = [PositionOut(**p.__dict__) for p in positions]
-        tot = TotalsOut(**totals)  # type: ignore[arg-type]
-        return PortfolioSummary(positions=pos, totals=tot)
+        return _json_response(_SUMMARY_JSON, {"positions": positions, "totals": totals})
 
 
 @app.get("/stats")
 def api_stats(account_id: Optional[int] = None):
-    cfg = get_config()
-    with session_scope(cfg.db_path) as s:
-        if account_id is not None:
-            accounts_count = s.exec(
-                select(func.count(dbm.Account.id)).where(dbm.Account.id == account_id)
-            ).one()
-            tx_count = s.exec(
-                select(func.count(dbm.Transaction.id)).where(
-                    dbm.Transaction.account_id == account_id
-                )
-            ).one()
-            return {"accounts": accounts_count, "transactions": tx_count}
-        accounts_count = s.exec(select(func.count(dbm.Account.id))).one()
-        tx_count = s.exec(select(func.count(dbm.Transaction.id))).one()
+    accounts = select(func.count(dbm.Account.id))
+    txs = select(func.count(dbm.Transaction.id))
+    if account_id is not None:
+        accounts = accounts.where(dbm.Account.id == account_id)
+        txs = txs.where(dbm.Transaction.account_id == account_id)
+    # Both counts as scalar subqueries of a single SELECT
+    stmt = select(accounts.scalar_subquery(), txs.scalar_subquery())
+    with _session() as s:
+        accounts_count, tx_count = s.exec(stmt).one()
     return {"accounts": accounts_count, "transactions": tx_count}
 
 
@@ -474,21 +710,19 @@ def api_roi_series(
     start = datetime(since.year, since.month, since.day, 23, 59, 59)
     end = datetime(until.year, until.month, until.day, 23, 59, 59)
 
-    cfg = get_config()
     out: list[RoiPoint] = []
-    with session_scope(cfg.db_path) as s:
-        cur = start
-        while cur <= end:
-            positions, totals = summarize_portfolio(
-                s, as_of=cur, quote=quote, account_id=account_id
-            )
-            v = float(totals["value"]) if totals["value"] is not None else 0.0
-            c = float(totals["cost_open"]) if totals["cost_open"] is not None else 0.0
-            roi = (v - c) / c if c not in (None, 0) else 0.0
-            out.append(
-                RoiPoint(date=cur.strftime("%Y-%m-%d"), roi=roi, value=v, cost_open=c)
-            )
-            cur += timedelta(days=1)
+    points = _daily_points(start, end)
+    with _session() as s:
+        timeline = portfolio_timeline(
+            s, points=points, quote=quote, account_id=account_id
+        )
+    for cur, totals in zip(points, timeline):
+        v = totals["value"]
+        c = totals["cost_open"]
+        roi = (v - c) / c if c != 0 else 0.0
+        out.append(
+            RoiPoint(date=cur.strftime("%Y-%m-%d"), roi=roi, value=v, cost_open=c)
+        )
     return out
 
 
@@ -514,25 +748,24 @@ def api_value_series(
     start = datetime(since.year, since.month, since.day, 23, 59, 59)
     end = datetime(until.year, until.month, until.day, 23, 59, 59)
 
-    cfg = get_config()
     out: list[ValuePoint] = []
-    with session_scope(cfg.db_path) as s:
-        # Attempt to ensure daily prices exist for held assets across the period
-        try:
-            holds = compute_holdings(s, as_of=end, account_id=account_id)
-            for sym in holds.keys():
-                pref = get_asset_preference(s, sym)
-                _ensure_daily_prices(s, sym, quote, start, end, preferred=pref)
-        except Exception:
-            pass
-        cur = start
-        while cur <= end:
-            _positions, totals = summarize_portfolio(
-                s, as_of=cur, quote=quote, account_id=account_id
-            )
-            v = float(totals["value"]) if totals["value"] is not None else 0.0
-            out.append(ValuePoint(date=cur.strftime("%Y-%m-%d"), value=v))
-            cur += timedelta(days=1)
+    # Attempt to ensure daily prices exist for held assets across the period;
+    # the backfill writes in its own short sessions before the series is read
+    try:
+        with _session() as s:
+            holds = current_holdings(s, as_of=end, account_id=account_id)
+            prefs = get_asset_preferences(s, holds.keys())
+        for sym in holds.keys():
+            _ensure_daily_prices(sym, quote, start, end, preferred=prefs[sym.upper()])
+    except Exception:
+        pass
+    with _session() as s:
+        points = _daily_points(start, end)
+        values = portfolio_value_series(
+            s, points=points, quote=quote, account_id=account_id
+        )
+    for cur, v in zip(points, values):
+        out.append(ValuePoint(date=cur.strftime("%Y-%m-%d"), value=v))
     return out
 
 
@@ -591,7 +824,6 @@ def api_export_transactions_csv(
     import csv
     import io
 
-    cfg = get_config()
     output = io.StringIO()
     w = csv.writer(output)
     # Header aligned with CLI export
@@ -616,7 +848,7 @@ def api_export_transactions_csv(
             "import_batch_id",
         ]
     )
-    with session_scope(cfg.db_path) as s:
+    with _session() as s:
         rows = list_transactions(
             s,
             account_id=account_id,
@@ -686,7 +918,6 @@ def api_import_transactions_csv(
     if dedupe_by not in ("external_id", "tx_hash", "none"):
         raise HTTPException(status_code=400, detail="invalid dedupe_by")
 
-    cfg = get_config()
     inserted = 0
     skipped = 0
 
@@ -700,7 +931,7 @@ def api_import_transactions_csv(
     try:
         src = GenericCSVImportSource()
         parsed = src.parse_csv(tmp_path, options={"mapping": {}})
-        with session_scope(cfg.db_path) as s:
+        with _session(write=True) as s:
             batch = create_import_batch(
                 s,
                 datasource=datasource or "generic_csv",
@@ -746,6 +977,7 @@ def api_import_transactions_csv(
                 batch.id,
                 summary=f"Inserted {inserted}, skipped {skipped} (dedupe_by={dedupe_by})",
             )
+            refresh_position_snapshots(s)
     finally:
         try:
             Path(tmp_path).unlink(missing_ok=True)
@@ -756,11 +988,18 @@ def api_import_transactions_csv(
 
 
 @app.get("/price/quote", response_model=QuoteOut)
-def api_price_quote(asset: str, quote: str = "USD", provider: Optional[str] = None):
-    cfg = get_config()
-    with session_scope(cfg.db_path) as s:
-        req_provider = provider if provider in get_price_sources().keys() else None
-        q = _latest_quote(s, asset, quote, req_provider)
+def api_price_quote(
+    asset: str,
+    background: BackgroundTasks,
+    quote: str = "USD",
+    provider: Optional[str] = None,
+    refresh: bool = Query(False, description="Bypass the in-process quote cache"),
+):
+    with _session() as s:
+        req_provider = provider if provider in get_price_sources() else None
+        q = _latest_quote(
+            s, asset, quote, req_provider, refresh=refresh, background=background
+        )
         if q is None:
             raise HTTPException(
                 status_code=502, detail="Failed to fetch quote from providers"
@@ -769,5 +1008,5 @@ def api_price_quote(asset: str, quote: str = "USD", provider: Optional[str] = No
 
 
 @app.get("/datasource/price", response_model=list[str])
-def api_list_price_sources():
-    return sorted(get_price_sources().keys())
+async def api_list_price_sources():
+    return list(get_price_source_names())
@@ -36,7 +36,7 @@ def add(
     ),
 ):
     cfg = get_config()
-    with session_scope(cfg.db_path) as s:
+    with session_scope(cfg.db_path, write=True) as s:
         acc = create_account(
             s,
             name=name,
@@ -98,7 +98,7 @@ def edit(
     currency: Optional[str] = typer.Option(None, "--currency"),
 ):
     cfg = get_config()
-    with session_scope(cfg.db_path) as s:
+    with session_scope(cfg.db_path, write=True) as s:
         acc = update_account(
             s,
             id,
@@ -122,7 +122,7 @@ def edit(
 @app.command("rm")
 def rm(id: int = typer.Option(..., "--id", help="Account id")):
     cfg = get_config()
-    with session_scope(cfg.db_path) as s:
+    with session_scope(cfg.db_path, write=True) as s:
         ok = delete_account(s, id)
     if not ok:
         console.print("[red]Account not found.[/red]")
@@ -7,13 +7,10 @@ from typing import Optional
 import typer
 
 from wealth_os.core.config import get_config
-from wealth_os.io.charts import (
-    generate_allocation_pie,
-    generate_realized_pnl_bar,
-    generate_value_timeseries_line,
-)
 
 
+# Chart renderers (matplotlib/seaborn) are imported inside each command so
+# `wealth chart --help` stays fast.
 app = typer.Typer(help="Generate charts")
 
 
@@ -24,6 +21,8 @@ def chart_allocation(
     quote: str = typer.Option("USD", "--quote"),
     account_id: Optional[int] = typer.Option(None, "--account-id"),
 ) -> None:
+    from wealth_os.io.charts import generate_allocation_pie
+
     cfg = get_config()
     as_of = as_of or datetime.utcnow()
     generate_allocation_pie(
@@ -40,6 +39,8 @@ def chart_value(
     quote: str = typer.Option("USD", "--quote"),
     account_id: Optional[int] = typer.Option(None, "--account-id"),
 ) -> None:
+    from wealth_os.io.charts import generate_value_timeseries_line
+
     cfg = get_config()
     until = until or datetime.utcnow()
     generate_value_timeseries_line(
@@ -61,6 +62,8 @@ def chart_pnl(
     quote: str = typer.Option("USD", "--quote"),
     account_id: Optional[int] = typer.Option(None, "--account-id"),
 ) -> None:
+    from wealth_os.io.charts import generate_realized_pnl_bar
+
     cfg = get_config()
     until = until or datetime.utcnow()
     generate_realized_pnl_bar(
@@ -28,8 +28,7 @@ def show() -> None:
     table.add_row("quote", ctx.quote or "-")
     table.add_row("providers", ctx.providers or "-")
     table.add_row("datasource", ctx.datasource or "-")
-    console.print(table)
-    console.print(info_panel(f"Context file: {get_context_path()}"))
+    console.print(table, info_panel(f"Context file: {get_context_path()}"))
 
 
 @app.command("get")
@@ -8,7 +8,7 @@ import typer
 
 from wealth_os.core.config import get_config
 from wealth_os.core.context import load_context
-from wealth_os.datasources.generic_csv import GenericCSVImportSource
+from wealth_os.core.valuation import refresh_position_snapshots
 from wealth_os.db.repo import (
     session_scope,
     create_transaction,
@@ -62,6 +62,9 @@ def import_csv(
             if not isinstance(mapping, dict):
                 raise typer.BadParameter("mapping-file must contain a JSON object")
 
+    # Deferred: pulls in pandas and registers every datasource
+    from wealth_os.datasources.generic_csv import GenericCSVImportSource
+
     src = GenericCSVImportSource()
     parsed = src.parse_csv(str(file), options={"mapping": mapping or {}})
 
@@ -72,7 +75,7 @@ def import_csv(
         typer.echo(f"Dry-run: parsed {len(parsed)} rows from {file}")
         raise typer.Exit(code=0)
 
-    with session_scope(cfg.db_path) as s:
+    with session_scope(cfg.db_path, write=True) as s:
         batch = create_import_batch(
             s, datasource=datasource, source_file=str(file), summary=None
         )
@@ -114,4 +117,5 @@ def import_csv(
             batch.id,
             summary=f"Inserted {inserted}, skipped {skipped} (dedupe_by={dedupe_by})",
         )
+        refresh_position_snapshots(s)
     typer.echo(f"Imported {inserted} rows, skipped {skipped} from {file}")
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import importlib
+from typing import Dict, List, Optional
+
+import click
+import typer
+from typer.core import TyperGroup
+
+
+class LazyTyperGroup(TyperGroup):
+    """Typer group that imports sub-apps only when they are first requested.
+
+    Subclasses set ``lazy_subcommands`` to a mapping of command name to
+    ``"module.path:attribute"`` pointing at a ``typer.Typer`` instance.
+    """
+
+    lazy_subcommands: Dict[str, str] = {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        names = super().list_commands(ctx)
+        return names + [n for n in self.lazy_subcommands if n not in names]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name not in self.commands and cmd_name in self.lazy_subcommands:
+            self.commands[cmd_name] = self._load(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load(self, cmd_name: str) -> click.Group:
+        module_path, attr = self.lazy_subcommands[cmd_name].split(":", 1)
+        sub_app = getattr(importlib.import_module(module_path), attr)
+        cmd = typer.main.get_group(sub_app)
+        cmd.name = cmd_name
+        return cmd
+
+
+def lazy_group(subcommands: Dict[str, str]) -> type[LazyTyperGroup]:
+    """Build a ``LazyTyperGroup`` subclass bound to ``subcommands``."""
+    return type(
+        "LazyTyperGroup", (LazyTyperGroup,), {"lazy_subcommands": dict(subcommands)}
+    )
@@ -7,12 +7,6 @@ from typing import Optional
 import typer
 
 from wealth_os.core.config import get_config
-from wealth_os.io.charts import (
-    generate_allocation_pie,
-    generate_realized_pnl_bar,
-    generate_value_timeseries_line,
-)
-from wealth_os.io.pdf_report import generate_pdf_report
 
 
 app = typer.Typer(help="Generate PDF report")
@@ -32,6 +26,14 @@ def generate(
     include_value: bool = typer.Option(True, "--include-value/--no-value"),
     include_pnl: bool = typer.Option(True, "--include-pnl/--no-pnl"),
 ) -> None:
+    # matplotlib and reportlab are only needed once a report is generated
+    from wealth_os.io.charts import (
+        generate_allocation_pie,
+        generate_realized_pnl_bar,
+        generate_value_timeseries_line,
+    )
+    from wealth_os.io.pdf_report import generate_pdf_report
+
     cfg = get_config()
     as_of = as_of or datetime.utcnow()
     until = until or as_of
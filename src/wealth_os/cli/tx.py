@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
 from typing import Optional
@@ -9,6 +10,7 @@ from wealth_os.cli.ui import console, fmt_decimal, success_panel
 
 from wealth_os.core.config import get_config
 from wealth_os.core.context import load_context
+from wealth_os.core.valuation import refresh_position_snapshots
 from wealth_os.db.models import TxSide
 from wealth_os.db.repo import (
     session_scope,
@@ -21,6 +23,21 @@ from wealth_os.db.repo import (
 
 app = typer.Typer(help="Manage transactions")
 
+# Plain decimals like "0.5" or "-12" skip the exception-guarded slow path
+_DEC_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+def _to_dec(x: Optional[str]) -> Optional[Decimal]:
+    """Parse an option value as Decimal; None passes through."""
+    if x is None:
+        return None
+    if _DEC_RE.fullmatch(x):
+        return Decimal(x)
+    try:
+        return Decimal(x.strip())
+    except InvalidOperation:
+        raise typer.BadParameter(f"Invalid decimal value: {x}")
+
 
 @app.command("add")
 def add(
@@ -48,16 +65,7 @@ def add(
     cfg = get_config()
     ctx = load_context()
 
-    # Convert decimals from strings
-    def _to_dec(x: Optional[str]) -> Optional[Decimal]:
-        if x is None:
-            return None
-        try:
-            return Decimal(str(x))
-        except InvalidOperation:
-            raise typer.BadParameter(f"Invalid decimal value: {x}")
-
-    with session_scope(cfg.db_path) as s:
+    with session_scope(cfg.db_path, write=True) as s:
         tx = create_transaction(
             s,
             ts=ts or datetime.utcnow(),
@@ -81,6 +89,7 @@ def add(
             raise typer.BadParameter(
                 "--account-id is required (set via --account-id or `wealth context set account_id <id>`)"
             )
+        refresh_position_snapshots(s)
         console.print(
             success_panel(
                 f"Created tx id={tx.id} asset={tx.asset_symbol} side={tx.side} qty={fmt_decimal(tx.qty)}"
@@ -88,6 +97,26 @@ def add(
         )
 
 
+_TX_COLUMNS = (
+    ("ID", "right"),
+    ("Timestamp", "left"),
+    ("Acct", "right"),
+    ("Asset", "left"),
+    ("Side", "left"),
+    ("Qty", "right"),
+    ("Price", "right"),
+    ("Total", "right"),
+    ("QCCY", "left"),
+)
+# Styled side cells built once: buys green, sells red, everything else yellow
+_SIDE_MARKUP = {
+    side: "[{0}]{1}[/{0}]".format(
+        {TxSide.buy: "green", TxSide.sell: "red"}.get(side, "yellow"), side
+    )
+    for side in TxSide
+}
+
+
 @app.command("list")
 def list_(
     account_id: Optional[int] = typer.Option(
@@ -119,28 +148,15 @@ def list_(
             console.print("[yellow]No transactions found.[/yellow]")
             raise typer.Exit(code=0)
         table = Table(title="Transactions")
-        table.add_column("ID", justify="right")
-        table.add_column("Timestamp")
-        table.add_column("Acct", justify="right")
-        table.add_column("Asset")
-        table.add_column("Side")
-        table.add_column("Qty", justify="right")
-        table.add_column("Price", justify="right")
-        table.add_column("Total", justify="right")
-        table.add_column("QCCY")
+        for name, justify in _TX_COLUMNS:
+            table.add_column(name, justify=justify)
         for t in rows:
-            side_str = str(t.side)
-            side_style = (
-                "green"
-                if "buy" in side_str
-                else ("red" if "sell" in side_str else "yellow")
-            )
             table.add_row(
                 str(t.id),
                 t.ts.isoformat(),
                 str(t.account_id),
                 t.asset_symbol,
-                f"[{side_style}]{t.side}[/{side_style}]",
+                _SIDE_MARKUP.get(t.side) or f"[yellow]{t.side}[/yellow]",
                 fmt_decimal(t.qty),
                 fmt_decimal(t.price_quote),
                 fmt_decimal(t.total_quote),
@@ -174,15 +190,7 @@ def edit(
     cfg = get_config()
     ctx = load_context()
 
-    def _to_dec(x: Optional[str]) -> Optional[Decimal]:
-        if x is None:
-            return None
-        try:
-            return Decimal(str(x))
-        except InvalidOperation:
-            raise typer.BadParameter(f"Invalid decimal value: {x}")
-
-    with session_scope(cfg.db_path) as s:
+    with session_scope(cfg.db_path, write=True) as s:
         tx = update_transaction(
             s,
             id,
@@ -204,6 +212,7 @@ def edit(
             tags=tags,
         )
         if tx:
+            refresh_position_snapshots(s)
             console.print(success_panel(f"Updated tx id={tx.id}"))
     if not tx:
         console.print("[red]Transaction not found.[/red]")
@@ -213,8 +222,10 @@ def edit(
 @app.command("rm")
 def rm(id: int = typer.Option(..., "--id")):
     cfg = get_config()
-    with session_scope(cfg.db_path) as s:
+    with session_scope(cfg.db_path, write=True) as s:
         ok = delete_transaction(s, id)
+        if ok:
+            refresh_position_snapshots(s)
     if not ok:
         console.print("[red]Transaction not found.[/red]")
         raise typer.Exit(code=1)
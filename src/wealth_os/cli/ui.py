@@ -21,11 +21,10 @@ def fmt_decimal(x: Optional[Decimal], max_places: int = 8) -> str:
     return s
 
 
-def fmt_money(x: Optional[Decimal]) -> str:
+def fmt_money(x: Optional[Decimal], missing: str = "") -> str:
     if x is None:
-        return ""
-    s = format(x, ".2f")
-    return s
+        return missing
+    return format(x, ".2f")
 
 
 def colorize_pnl(x: Optional[Decimal]) -> Text:
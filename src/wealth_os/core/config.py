@@ -4,6 +4,7 @@ import os
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
+from typing import Dict, Optional
 
 from dotenv import load_dotenv
 
@@ -34,3 +35,25 @@ def get_config() -> Config:
         db_path=_resolve_db_path(),
         base_currency=os.getenv("WEALTH_BASE_CURRENCY", "USD"),
     )
+
+
+def child_env(extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Environment for subprocesses with the resolved config pinned.
+
+    Children then see the same DB path and currency as this process, even if
+    they run from another directory or without the parent's ``.env``.
+    """
+    cfg = get_config()
+    env = dict(os.environ)
+    env["WEALTH_DB_PATH"] = cfg.db_path
+    env["WEALTH_BASE_CURRENCY"] = cfg.base_currency
+    if extra:
+        env.update(extra)
+    return env
+
+
+def __getattr__(name: str):
+    # PEP 562: `config.CONFIG` resolves (and caches) the config on first access
+    if name == "CONFIG":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
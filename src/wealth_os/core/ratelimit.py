@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+
+# Defaults match the historical 0.25s pacing between provider calls
+DEFAULT_RATE_PER_SEC = 4.0
+DEFAULT_BURST = 4
+
+
+class TokenBucket:
+    """Thread-safe token bucket used to pace calls to a price provider.
+
+    Tokens refill continuously at ``rate_per_sec`` up to ``burst``; ``acquire``
+    only blocks when the bucket is empty or the provider asked us to back off.
+    """
+
+    def __init__(self, rate_per_sec: float, burst: int):
+        if rate_per_sec <= 0:
+            raise ValueError("rate_per_sec must be positive")
+        self.rate = float(rate_per_sec)
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.RLock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def acquire(self, cost: float = 1.0) -> float:
+        """Take ``cost`` tokens, sleeping as needed. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    delay = self._blocked_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= cost:
+                        self._tokens -= cost
+                        return waited
+                    delay = (cost - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def penalize(self, retry_after: Optional[float] = None) -> None:
+        """Drain the bucket and block until ``retry_after`` seconds from now."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = 0.0
+            pause = retry_after if retry_after and retry_after > 0 else 1.0 / self.rate
+            self._blocked_until = max(self._blocked_until, now + pause)
+
+
+_BUCKETS: Dict[str, TokenBucket] = {}
+_BUCKETS_LOCK = threading.Lock()
+
+
+def _bucket_settings(name: str) -> tuple[float, int]:
+    """Read ``WEALTH_RATE_<NAME>=rate,burst`` (e.g. ``0.5,1``) from the env."""
+    raw = os.getenv(f"WEALTH_RATE_{name.upper()}")
+    if not raw:
+        return DEFAULT_RATE_PER_SEC, DEFAULT_BURST
+    rate_s, _, burst_s = raw.partition(",")
+    try:
+        rate = float(rate_s)
+        burst = int(burst_s) if burst_s.strip() else DEFAULT_BURST
+    except ValueError:
+        return DEFAULT_RATE_PER_SEC, DEFAULT_BURST
+    if rate <= 0:
+        return DEFAULT_RATE_PER_SEC, DEFAULT_BURST
+    return rate, burst
+
+
+def get_bucket(name: str) -> TokenBucket:
+    """Return the shared bucket for provider ``name``, creating it on first use."""
+    with _BUCKETS_LOCK:
+        bucket = _BUCKETS.get(name)
+        if bucket is None:
+            bucket = TokenBucket(*_bucket_settings(name))
+            _BUCKETS[name] = bucket
+        return bucket
@@ -1,14 +1,29 @@
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, List, Optional, Tuple
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
 
+from sqlalchemy import func, or_
 from sqlmodel import Session, select
 
-from wealth_os.db.models import Transaction, TxSide
-from wealth_os.db.repo import get_last_price
+from wealth_os.db.models import (
+    AssetPreference,
+    PositionSnapshot,
+    PositionSnapshotState,
+    Price,
+    Transaction,
+    TxSide,
+)
+from wealth_os.db.repo import (
+    get_last_prices,
+    get_position_snapshot,
+    get_tx_version,
+    pop_ledger_writes,
+    replace_position_snapshot,
+)
 
 
 @dataclass
@@ -23,6 +38,9 @@ class Position:
     realized_pnl: Decimal
 
 
+_PositionMaps = Tuple[Dict[str, Decimal], Dict[str, Decimal], Dict[str, Decimal]]
+
+
 def _dec(x) -> Decimal:
     if isinstance(x, Decimal):
         return x
@@ -32,29 +50,31 @@ def _dec(x) -> Decimal:
 def compute_holdings(
     session: Session, *, as_of: datetime, account_id: int | None = None
 ) -> Dict[str, Decimal]:
-    stmt = select(Transaction).where(Transaction.ts <= as_of)
-    if account_id is not None:
-        stmt = stmt.where(Transaction.account_id == account_id)
-    stmt = stmt.order_by(Transaction.ts.asc())
     holdings: Dict[str, Decimal] = {}
-    rows = session.exec(stmt).all()
-    for t in rows:
-        sym = t.asset_symbol.upper()
-        qty = _dec(t.qty) if t.qty is not None else Decimal(0)
-        if t.side in (TxSide.buy, TxSide.transfer_in, TxSide.stake, TxSide.reward):
-            holdings[sym] = holdings.get(sym, Decimal(0)) + qty
-        elif t.side in (TxSide.sell, TxSide.transfer_out):
-            holdings[sym] = holdings.get(sym, Decimal(0)) - qty
-        elif t.side == TxSide.fee:
-            holdings[sym] = holdings.get(sym, Decimal(0)) - qty
-        # apply fee deduction on fee_asset if present
-        if t.fee_qty and t.fee_asset:
-            fqty = _dec(t.fee_qty)
-            fasset = t.fee_asset.upper()
-            holdings[fasset] = holdings.get(fasset, Decimal(0)) - fqty
+    for t in _transactions(session, as_of=as_of, account_id=account_id):
+        for sym, delta in _holding_deltas(t):
+            holdings[sym] = holdings.get(sym, Decimal(0)) + delta
     return {k: v for k, v in holdings.items() if v != 0}
 
 
+_INFLOW_SIDES = (TxSide.buy, TxSide.transfer_in, TxSide.stake, TxSide.reward)
+_OUTFLOW_SIDES = (TxSide.sell, TxSide.transfer_out, TxSide.fee)
+
+
+def _holding_deltas(t: Transaction) -> List[Tuple[str, Decimal]]:
+    """Signed quantity changes a transaction applies to holdings."""
+    out: List[Tuple[str, Decimal]] = []
+    qty = _dec(t.qty) if t.qty is not None else Decimal(0)
+    if t.side in _INFLOW_SIDES:
+        out.append((t.asset_symbol.upper(), qty))
+    elif t.side in _OUTFLOW_SIDES:
+        out.append((t.asset_symbol.upper(), -qty))
+    # apply fee deduction on fee_asset if present
+    if t.fee_qty and t.fee_asset:
+        out.append((t.fee_asset.upper(), -_dec(t.fee_qty)))
+    return out
+
+
 def compute_realized_and_open_cost_fifo(
     session: Session,
     *,
@@ -67,63 +87,91 @@ def compute_realized_and_open_cost_fifo(
     - Other sides are ignored for PnL and cost basis.
     - Fees are ignored in PnL to keep it simple for v1.
     """
+    lots: Dict[str, Deque] = {}  # asset -> FIFO of [qty_remaining, cost_per_unit]
+    realized: Dict[str, Decimal] = {}
+    for t in _transactions(session, as_of=as_of, account_id=account_id):
+        _apply_fifo(t, lots, realized)
+    return realized, _open_cost(lots)
+
+
+def _transactions(
+    session: Session, *, as_of: datetime, account_id: int | None = None
+) -> List[Transaction]:
     stmt = select(Transaction).where(Transaction.ts <= as_of)
     if account_id is not None:
         stmt = stmt.where(Transaction.account_id == account_id)
-    stmt = stmt.order_by(Transaction.ts.asc())
-    rows = session.exec(stmt).all()
+    return list(session.exec(stmt.order_by(Transaction.ts.asc(), Transaction.id.asc())))
 
-    lots: Dict[
-        str, List[Tuple[Decimal, Decimal]]
-    ] = {}  # asset -> list of (qty_remaining, cost_per_unit)
+
+def _replay(
+    session: Session, *, as_of: datetime, account_id: int | None = None
+) -> _PositionMaps:
+    """(holdings, open_cost, realized) from one pass over the transactions.
+
+    Same results as ``compute_holdings`` plus
+    ``compute_realized_and_open_cost_fifo`` with half the queries and loops.
+    """
+    holdings: Dict[str, Decimal] = {}
+    lots: Dict[str, Deque] = {}
     realized: Dict[str, Decimal] = {}
-    for t in rows:
-        if t.side == TxSide.buy:
-            qty = _dec(t.qty)
-            if qty == 0:
-                continue
-            # determine total cost in quote ccy
-            total_cost = (
-                _dec(t.total_quote)
-                if t.total_quote is not None
-                else (
-                    _dec(t.price_quote) * qty
-                    if t.price_quote is not None
-                    else Decimal(0)
-                )
+    for t in _transactions(session, as_of=as_of, account_id=account_id):
+        for sym, delta in _holding_deltas(t):
+            holdings[sym] = holdings.get(sym, Decimal(0)) + delta
+        _apply_fifo(t, lots, realized)
+    held = {k: v for k, v in holdings.items() if v != 0}
+    return held, _open_cost(lots), realized
+
+
+def _apply_fifo(
+    t: Transaction, lots: Dict[str, Deque], realized: Dict[str, Decimal]
+) -> None:
+    """Apply one transaction to FIFO ``lots`` and accumulate ``realized`` PnL."""
+    if t.side == TxSide.buy:
+        qty = _dec(t.qty)
+        if qty == 0:
+            return
+        # determine total cost in quote ccy
+        total_cost = (
+            _dec(t.total_quote)
+            if t.total_quote is not None
+            else (
+                _dec(t.price_quote) * qty if t.price_quote is not None else Decimal(0)
             )
-            cpu = (total_cost / qty) if qty != 0 else Decimal(0)
-            lots.setdefault(t.asset_symbol.upper(), []).append([qty, cpu])
-        elif t.side == TxSide.sell:
-            qty_to_sell = _dec(t.qty)
-            proceeds = (
-                _dec(t.total_quote)
-                if t.total_quote is not None
-                else (
-                    _dec(t.price_quote) * qty_to_sell
-                    if t.price_quote is not None
-                    else Decimal(0)
-                )
+        )
+        cpu = (total_cost / qty) if qty != 0 else Decimal(0)
+        lots.setdefault(t.asset_symbol.upper(), deque()).append([qty, cpu])
+    elif t.side == TxSide.sell:
+        qty_to_sell = _dec(t.qty)
+        proceeds = (
+            _dec(t.total_quote)
+            if t.total_quote is not None
+            else (
+                _dec(t.price_quote) * qty_to_sell
+                if t.price_quote is not None
+                else Decimal(0)
             )
-            cost_accum = Decimal(0)
-            sym = t.asset_symbol.upper()
-            sym_lots = lots.setdefault(sym, [])
-            remaining = qty_to_sell
-            while remaining > 0 and sym_lots:
-                lot_qty, cpu = sym_lots[0]
-                take = lot_qty if lot_qty <= remaining else remaining
-                cost_accum += take * cpu
-                lot_qty = lot_qty - take
-                remaining -= take
-                if lot_qty == 0:
-                    sym_lots.pop(0)
-                else:
-                    sym_lots[0] = [lot_qty, cpu]
-            # If remaining > 0 with no lots, cost is zero (short) for v1
-            pnl = proceeds - cost_accum
-            realized[sym] = realized.get(sym, Decimal(0)) + pnl
-        # ignore other sides for realized pnl
+        )
+        cost_accum = Decimal(0)
+        sym = t.asset_symbol.upper()
+        sym_lots = lots.setdefault(sym, deque())
+        remaining = qty_to_sell
+        while remaining > 0 and sym_lots:
+            lot_qty, cpu = sym_lots[0]
+            take = lot_qty if lot_qty <= remaining else remaining
+            cost_accum += take * cpu
+            lot_qty = lot_qty - take
+            remaining -= take
+            if lot_qty == 0:
+                sym_lots.popleft()
+            else:
+                sym_lots[0] = [lot_qty, cpu]
+        # If remaining > 0 with no lots, cost is zero (short) for v1
+        pnl = proceeds - cost_accum
+        realized[sym] = realized.get(sym, Decimal(0)) + pnl
+    # ignore other sides for realized pnl
 
+
+def _open_cost(lots: Dict[str, Deque]) -> Dict[str, Decimal]:
     open_cost: Dict[str, Decimal] = {}
     for sym, sym_lots in lots.items():
         total = Decimal(0)
@@ -131,7 +179,153 @@ def compute_realized_and_open_cost_fifo(
             total += lot_qty * cpu
         if total != 0:
             open_cost[sym] = total
-    return realized, open_cost
+    return open_cost
+
+
+def _snapshot_positions(
+    session: Session, *, as_of: datetime, account_id: int | None = None
+) -> _PositionMaps | None:
+    """(holdings, open_cost, realized) from the stored ``PositionSnapshot``.
+
+    The snapshot covers every transaction, so it only answers ``as_of`` at or
+    after the newest one (None otherwise). Read-only: a snapshot older than the
+    ledger version bumped by the transaction triggers is ignored (None) until
+    the writer calls ``refresh_position_snapshots``.
+    """
+    scope = account_id or 0
+    stored = get_position_snapshot(session, scope, tx_version=get_tx_version(session))
+    if stored is None:
+        return None
+    state, rows = stored
+    if state.max_tx_ts is not None and as_of < state.max_tx_ts:
+        return None
+    holdings = {r.asset_symbol: _dec(r.qty) for r in rows}
+    open_cost = {
+        r.asset_symbol: _dec(r.cost_open) for r in rows if r.cost_open is not None
+    }
+    realized = {r.asset_symbol: _dec(r.realized_pnl) for r in rows}
+    return holdings, open_cost, realized
+
+
+def current_holdings(
+    session: Session, *, as_of: datetime, account_id: int | None = None
+) -> Dict[str, Decimal]:
+    """``compute_holdings`` served from the position snapshot when it applies."""
+    snap = _snapshot_positions(session, as_of=as_of, account_id=account_id)
+    if snap is not None:
+        return snap[0]
+    return compute_holdings(session, as_of=as_of, account_id=account_id)
+
+
+def _max_tx_ts(session: Session, account_id: int | None) -> datetime | None:
+    stmt = select(func.max(Transaction.ts))
+    if account_id is not None:
+        stmt = stmt.where(Transaction.account_id == account_id)
+    return session.exec(stmt).first()
+
+
+def _snapshot_rows(
+    scope: int, positions: _PositionMaps, assets: Iterable[str]
+) -> list[PositionSnapshot]:
+    holdings, open_cost, realized = positions
+    return [
+        PositionSnapshot(
+            scope=scope,
+            asset_symbol=sym,
+            qty=holdings[sym],
+            cost_open=open_cost.get(sym),
+            realized_pnl=realized.get(sym, Decimal(0)),
+        )
+        for sym in assets
+        if sym in holdings
+    ]
+
+
+def _rebuild_snapshot(
+    session: Session, scope: int, version: int, account_id: int | None
+) -> None:
+    max_ts = _max_tx_ts(session, account_id)
+    positions = _replay(session, as_of=max_ts or datetime.max, account_id=account_id)
+    replace_position_snapshot(
+        session,
+        scope,
+        tx_version=version,
+        max_tx_ts=max_ts,
+        rows=_snapshot_rows(scope, positions, positions[0]),
+    )
+
+
+def _update_snapshot_assets(
+    session: Session,
+    scope: int,
+    version: int,
+    account_id: int | None,
+    assets: set[str],
+) -> None:
+    """Re-derive only ``assets`` in a snapshot that was current before the writes.
+
+    An asset's holdings depend only on transactions in that asset or paying
+    fees in it, and its FIFO lots only on its own buys and sells, so those
+    transactions alone give exact positions for ``assets``.
+    """
+    stmt = select(Transaction).where(
+        or_(Transaction.asset_symbol.in_(assets), Transaction.fee_asset.in_(assets))
+    )
+    if account_id is not None:
+        stmt = stmt.where(Transaction.account_id == account_id)
+    holdings: Dict[str, Decimal] = {}
+    lots: Dict[str, Deque] = {}
+    realized: Dict[str, Decimal] = {}
+    for t in session.exec(stmt.order_by(Transaction.ts.asc(), Transaction.id.asc())):
+        for sym, delta in _holding_deltas(t):
+            holdings[sym] = holdings.get(sym, Decimal(0)) + delta
+        _apply_fifo(t, lots, realized)
+    held = {k: v for k, v in holdings.items() if v != 0}
+    replace_position_snapshot(
+        session,
+        scope,
+        tx_version=version,
+        max_tx_ts=_max_tx_ts(session, account_id),
+        rows=_snapshot_rows(scope, (held, _open_cost(lots), realized), assets),
+        assets=assets,
+    )
+
+
+def refresh_position_snapshots(session: Session) -> None:
+    """Bring position snapshots up to date after this session's ledger writes.
+
+    Call at the end of any write session that changes transactions, so the
+    snapshots change in the same transaction as the writes they reflect.
+    Snapshots that were current before the writes only re-derive the assets
+    the writes touched (all accounts, plus each touched account); untouched
+    ones are just stamped with the new version. Snapshots that were already
+    stale, or do not exist yet for a touched account, are rebuilt in full.
+    """
+    base, touched = pop_ledger_writes(session)
+    if base is None:
+        return
+    session.flush()
+    version = get_tx_version(session)
+    if version == base:
+        return
+    assets_by_scope: Dict[int, set[str]] = {0: set()}
+    for account_id, sym in touched:
+        assets_by_scope[0].add(sym)
+        assets_by_scope.setdefault(account_id, set()).add(sym)
+    states = {st.scope: st for st in session.exec(select(PositionSnapshotState))}
+    for scope in sorted(assets_by_scope.keys() | states.keys()):
+        state = states.get(scope)
+        account_id = scope or None
+        if state is None or state.tx_version != base:
+            _rebuild_snapshot(session, scope, version, account_id)
+        elif scope in assets_by_scope:
+            _update_snapshot_assets(
+                session, scope, version, account_id, assets_by_scope[scope]
+            )
+        else:
+            state.tx_version = version
+            session.add(state)
+    session.flush()
 
 
 def summarize_portfolio(
@@ -141,10 +335,13 @@ def summarize_portfolio(
     quote: str = "USD",
     account_id: int | None = None,
 ) -> Tuple[List[Position], Dict[str, Decimal]]:
-    holdings = compute_holdings(session, as_of=as_of, account_id=account_id)
-    realized_by_asset, open_cost = compute_realized_and_open_cost_fifo(
-        session, as_of=as_of, account_id=account_id
-    )
+    snap = _snapshot_positions(session, as_of=as_of, account_id=account_id)
+    if snap is not None:
+        holdings, open_cost, realized_by_asset = snap
+    else:
+        holdings, open_cost, realized_by_asset = _replay(
+            session, as_of=as_of, account_id=account_id
+        )
     positions: List[Position] = []
     totals = {
         "value": Decimal(0),
@@ -152,10 +349,11 @@ def summarize_portfolio(
         "unrealized": Decimal(0),
         "realized": Decimal(0),
     }
+    last_prices = get_last_prices(
+        session, asset_symbols=holdings.keys(), quote_ccy=quote, as_of=as_of
+    )
     for sym, qty in sorted(holdings.items()):
-        price_row = get_last_price(
-            session, asset_symbol=sym, quote_ccy=quote, as_of=as_of
-        )
+        price_row = last_prices.get(sym)
         price = _dec(price_row.price) if price_row is not None else None
         value = (qty * price) if (price is not None) else None
         cost = open_cost.get(sym)
@@ -181,3 +379,184 @@ def summarize_portfolio(
             totals["unrealized"] += unreal
         totals["realized"] += realized
     return positions, totals
+
+
+def portfolio_value_series(
+    session: Session,
+    *,
+    points: Sequence[datetime],
+    quote: str = "USD",
+    account_id: int | None = None,
+    transactions: Sequence[Transaction] | None = None,
+) -> List[float]:
+    """Total portfolio value at each of ``points`` (ascending), as floats.
+
+    Equivalent to ``summarize_portfolio(as_of=p)[1]["value"]`` per point, but
+    loads transactions and prices once and values every point with pandas
+    instead of re-querying per point. ``transactions`` (ascending, up to
+    ``max(points)``) skips the transaction query when already loaded.
+    """
+    import pandas as pd
+
+    if not points:
+        return []
+    index = pd.DatetimeIndex(points)
+    until = max(points)
+    qccy = quote.upper()
+
+    if transactions is None:
+        transactions = _transactions(session, as_of=until, account_id=account_id)
+    deltas = [
+        (t.ts, sym, float(delta))
+        for t in transactions
+        for sym, delta in _holding_deltas(t)
+    ]
+    if not deltas:
+        return [0.0] * len(points)
+    tx = pd.DataFrame(deltas, columns=["ts", "asset", "delta"])
+    # Running quantity per asset, sampled at each point (last tx at or before it)
+    qty = (
+        tx.pivot_table(index="ts", columns="asset", values="delta", aggfunc="sum")
+        .fillna(0.0)
+        .cumsum()
+        .reindex(index, method="ffill")
+        .fillna(0.0)
+    )
+
+    price_stmt = (
+        select(
+            Price.ts,
+            Price.asset_symbol,
+            Price.price,
+            Price.source,
+            AssetPreference.preferred_price_source,
+        )
+        .outerjoin(AssetPreference, AssetPreference.asset_symbol == Price.asset_symbol)
+        .where(
+            Price.asset_symbol.in_(list(qty.columns)),
+            Price.quote_ccy == qccy,
+            Price.ts <= until,
+        )
+        .order_by(Price.ts.asc())
+    )
+    prices = pd.DataFrame(
+        [
+            (ts, sym, float(price), source is not None and source == pref)
+            for ts, sym, price, source, pref in session.exec(price_stmt)
+        ],
+        columns=["ts", "asset", "price", "preferred"],
+    )
+    if prices.empty:
+        return [0.0] * len(points)
+
+    def _last_price_at_points(frame: "pd.DataFrame") -> "pd.DataFrame":
+        return frame.pivot(index="ts", columns="asset", values="price").reindex(
+            index, method="ffill"
+        )
+
+    # Same rule as get_last_price: latest preferred-source row, else latest any
+    px = _last_price_at_points(prices[prices["preferred"]]).combine_first(
+        _last_price_at_points(prices)
+    )
+    values = (qty * px.reindex(columns=qty.columns)).sum(axis=1, skipna=True)
+    return values.tolist()
+
+
+# Float quantities within this of zero count as fully disposed in the series
+_QTY_EPSILON = 1e-12
+
+
+def _float_amount(t: Transaction, qty: float) -> float:
+    """Quote-currency total of a buy/sell (``total_quote``, else price x qty)."""
+    if t.total_quote is not None:
+        return float(t.total_quote)
+    if t.price_quote is not None:
+        return float(t.price_quote) * qty
+    return 0.0
+
+
+def portfolio_cost_series(
+    session: Session,
+    *,
+    points: Sequence[datetime],
+    account_id: int | None = None,
+    transactions: Sequence[Transaction] | None = None,
+) -> List[float]:
+    """Open FIFO cost of held assets at each of ``points`` (ascending).
+
+    Matches ``summarize_portfolio(as_of=p)[1]["cost_open"]`` per point in a
+    single sweep over the transactions. Unlike the Decimal summary, the
+    sweep runs in float (the series is float anyway), keeping a running
+    open cost per asset instead of re-summing every lot at each point;
+    results agree to float rounding. ``transactions`` is as for
+    ``portfolio_value_series``.
+    """
+    if not points:
+        return []
+    rows = transactions
+    if rows is None:
+        rows = _transactions(session, as_of=max(points), account_id=account_id)
+
+    holdings: Dict[str, float] = {}
+    lots: Dict[str, Deque] = {}  # asset -> FIFO of [qty_remaining, cost_per_unit]
+    open_cost: Dict[str, float] = {}
+    out: List[float] = []
+    i = 0
+    for point in points:
+        while i < len(rows) and rows[i].ts <= point:
+            t = rows[i]
+            i += 1
+            for sym, delta in _holding_deltas(t):
+                holdings[sym] = holdings.get(sym, 0.0) + float(delta)
+            qty = float(t.qty) if t.qty is not None else 0.0
+            sym = t.asset_symbol.upper()
+            if t.side == TxSide.buy and qty != 0:
+                amount = _float_amount(t, qty)
+                lots.setdefault(sym, deque()).append([qty, amount / qty])
+                open_cost[sym] = open_cost.get(sym, 0.0) + amount
+            elif t.side == TxSide.sell:
+                sym_lots = lots.get(sym)
+                remaining = qty
+                while remaining > 0 and sym_lots:
+                    lot = sym_lots[0]
+                    take = min(lot[0], remaining)
+                    open_cost[sym] -= take * lot[1]
+                    lot[0] -= take
+                    remaining -= take
+                    if lot[0] <= 0:
+                        sym_lots.popleft()
+                if sym_lots is not None and not sym_lots:
+                    # Drop float residue once every lot is consumed
+                    open_cost[sym] = 0.0
+        out.append(
+            sum(
+                cost
+                for sym, cost in open_cost.items()
+                if abs(holdings.get(sym, 0.0)) > _QTY_EPSILON
+            )
+        )
+    return out
+
+
+def portfolio_timeline(
+    session: Session,
+    *,
+    points: Sequence[datetime],
+    quote: str = "USD",
+    account_id: int | None = None,
+) -> List[Dict[str, float]]:
+    """``{"value", "cost_open"}`` totals at each of ``points`` (ascending).
+
+    Replaces calling ``summarize_portfolio`` once per point in time-series views.
+    Both sweeps share one load of the transactions.
+    """
+    if not points:
+        return []
+    rows = _transactions(session, as_of=max(points), account_id=account_id)
+    values = portfolio_value_series(
+        session, points=points, quote=quote, account_id=account_id, transactions=rows
+    )
+    costs = portfolio_cost_series(
+        session, points=points, account_id=account_id, transactions=rows
+    )
+    return [{"value": v, "cost_open": c} for v, c in zip(values, costs)]
@@ -2,13 +2,31 @@ from __future__ import annotations
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+from typing import Any, Dict, Iterable, List, Optional, Protocol, runtime_checkable
 
 from pydantic import BaseModel
 
 from wealth_os.db.models import TxSide
 
 
+class RateLimitError(RuntimeError):
+    """Raised by price providers when the upstream API rejects a call with 429."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header given in seconds; HTTP dates are ignored."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
 class PriceQuote(BaseModel):
     symbol: str
     quote_ccy: str = "USD"
@@ -58,7 +76,9 @@ class PriceDataSource(Protocol):
         end: datetime,
         interval: str = "1d",
         quote: str = "USD",
-    ) -> List[OHLCVPoint]: ...
+    ) -> Iterable[OHLCVPoint]:
+        """Return points for [start, end]; may be a lazy iterator/generator."""
+        ...
 
     def resolve_symbol_id(self, symbol: str) -> Optional[str]:
         """Optional: map symbol to provider-specific ID."""
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+DEFAULT_TTL_SECONDS = 120.0
+DEFAULT_MAXSIZE = 1024
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire ``ttl`` seconds after being set.
+
+    Used to short-circuit repeated provider calls (quotes) within a process.
+    """
+
+    def __init__(
+        self, ttl: float = DEFAULT_TTL_SECONDS, maxsize: int = DEFAULT_MAXSIZE
+    ):
+        self.ttl = float(ttl)
+        self.maxsize = max(1, int(maxsize))
+        self._data: OrderedDict[Hashable, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[T] = None) -> Optional[T]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires, value = item
+            if expires <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value  # type: ignore[return-value]
+
+    def set(self, key: Hashable, value: object) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """Return the cached value for ``key`` or compute, store and return it.
+
+        Exceptions from ``compute`` propagate and nothing is cached.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value  # type: ignore[return-value]
+        value = compute()
+        self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _ttl_from_env() -> float:
+    raw = os.getenv("WEALTH_QUOTE_TTL")
+    try:
+        return float(raw) if raw else DEFAULT_TTL_SECONDS
+    except ValueError:
+        return DEFAULT_TTL_SECONDS
+
+
+# Latest quotes keyed by (provider, symbol, quote_ccy)
+quote_cache = TTLCache(ttl=_ttl_from_env())
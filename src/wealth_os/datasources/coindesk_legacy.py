@@ -3,14 +3,20 @@ from __future__ import annotations
 import os
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, Optional
 
 import requests
 
-from .base import OHLCVPoint, PriceQuote
+from ..core.ratelimit import get_bucket
+from .base import OHLCVPoint, PriceQuote, RateLimitError, parse_retry_after
+from .http import build_session
 from .registry import register_price_source
 
 
+# Shared by all clients so repeated calls reuse pooled keep-alive connections
+_SESSION = build_session()
+
+
 class _CDClient:
     def __init__(self, api_key: str, base_url: Optional[str] = None):
         self.api_key = api_key
@@ -20,19 +26,27 @@ class _CDClient:
         if "://" not in base:
             base = "https://" + base
         self.base_url = base.rstrip("/")
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "Accept": "application/json",
-                "Content-type": "application/json; charset=UTF-8",
-                "authorization": f"Apikey {api_key}",
-                "User-Agent": "wealth-cli/0.1",
-            }
-        )
+        self.session = _SESSION
+        self.headers = {
+            "Accept": "application/json",
+            "Content-type": "application/json; charset=UTF-8",
+            "Connection": "keep-alive",
+            "authorization": f"Apikey {api_key}",
+            "User-Agent": "wealth-cli/0.1",
+        }
 
     def get(self, path: str, params: Optional[Dict[str, str]] = None) -> dict:
         url = f"{self.base_url}{path}"
-        r = self.session.get(url, params=params, timeout=30)
+        # Pace every HTTP request (each OHLCV page included) on the shared bucket
+        bucket = get_bucket("coindesk")
+        bucket.acquire()
+        r = self.session.get(url, params=params, headers=self.headers, timeout=30)
+        if r.status_code == 429:
+            retry_after = parse_retry_after(r.headers.get("Retry-After"))
+            bucket.penalize(retry_after)
+            raise RateLimitError(
+                "Coindesk rate limit exceeded (HTTP 429)", retry_after=retry_after
+            )
         try:
             r.raise_for_status()
         except requests.HTTPError as e:
@@ -58,10 +72,10 @@ class _CDClient:
 
     def histoday(
         self, fsym: str, tsym: str, start: datetime, end: datetime
-    ) -> List[OHLCVPoint]:
+    ) -> Iterator[OHLCVPoint]:
+        """Yield daily points page by page (newest page first, ascending within a page)."""
         # CryptoCompare histoday: returns up to 2000 daily points per request, ending at toTs
         max_points = 2000
-        out: List[OHLCVPoint] = []
         # normalize to naive UTC
         if start.tzinfo is not None:
             start = start.astimezone(timezone.utc).replace(tzinfo=None)
@@ -95,24 +109,19 @@ class _CDClient:
                 ts = datetime.utcfromtimestamp(int(d["time"]))
                 if ts < start or ts > end:
                     continue
-                out.append(
-                    OHLCVPoint(
-                        ts=ts,
-                        open=Decimal(str(d["open"])),
-                        high=Decimal(str(d["high"])),
-                        low=Decimal(str(d["low"])),
-                        close=Decimal(str(d["close"])),
-                        volume=Decimal(str(d.get("volumefrom", 0))),
-                    )
+                yield OHLCVPoint(
+                    ts=ts,
+                    open=Decimal(str(d["open"])),
+                    high=Decimal(str(d["high"])),
+                    low=Decimal(str(d["low"])),
+                    close=Decimal(str(d["close"])),
+                    volume=Decimal(str(d.get("volumefrom", 0))),
                 )
             # Move window earlier
             earliest = data[0]["time"]
             to_ts = int(earliest) - 1
             if len(data) < limit + 1 and to_ts <= int(start.timestamp()):
                 break
-        # ensure sorted ascending
-        out.sort(key=lambda p: p.ts)
-        return out
 
 
 @register_price_source
@@ -137,7 +146,7 @@ class CoindeskLegacyPriceSource:
         end: datetime,
         interval: str = "1d",
         quote: str = "USD",
-    ) -> List[OHLCVPoint]:
+    ) -> Iterator[OHLCVPoint]:
         if interval not in ("1d", "daily", "day", "histoday"):
             raise NotImplementedError(
                 "Coindesk legacy provider supports daily candles only"
@@ -1,17 +1,27 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, Optional
 
 import requests
 
 import os
 
-from .base import OHLCVPoint, PriceQuote
+from ..core.ratelimit import get_bucket
+from .base import OHLCVPoint, PriceQuote, RateLimitError, parse_retry_after
+from .http import build_session
 from .registry import register_price_source
 
 
+# Shared by all clients so repeated calls reuse pooled keep-alive connections
+_SESSION = build_session()
+
+# Daily history is requested in windows of this size so each response stays
+# small and points reach the caller page by page instead of after one huge body.
+_OHLCV_WINDOW = timedelta(days=365)
+
+
 class _CMCClient:
     def __init__(self, api_key: str, base_url: str):
         self.api_key = api_key
@@ -19,21 +29,27 @@ class _CMCClient:
         if "://" not in base_url:
             base_url = "https://" + base_url
         self.base_url = base_url.rstrip("/")
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "Accept": "application/json",
-                "Accepts": "application/json",
-                "X-CMC_PRO_API_KEY": api_key,
-                "User-Agent": "wealth-cli/0.1",
-            }
-        )
+        self.session = _SESSION
+        self.headers = {
+            "Accept": "application/json",
+            "Accepts": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+            "X-CMC_PRO_API_KEY": api_key,
+            "User-Agent": "wealth-cli/0.1",
+        }
 
     def get(self, path: str, params: Optional[Dict[str, str]] = None) -> dict:
         url = f"{self.base_url}{path}"
-        r = self.session.get(url, params=params, timeout=30)
+        # Pace every HTTP request (each OHLCV page included) on the shared bucket
+        bucket = get_bucket("coinmarketcap")
+        bucket.acquire()
+        r = self.session.get(url, params=params, headers=self.headers, timeout=30)
         if r.status_code == 429:
-            raise RuntimeError("CoinMarketCap rate limit exceeded (HTTP 429)")
+            retry_after = parse_retry_after(r.headers.get("Retry-After"))
+            bucket.penalize(retry_after)
+            raise RateLimitError(
+                "CoinMarketCap rate limit exceeded (HTTP 429)", retry_after=retry_after
+            )
         try:
             r.raise_for_status()
         except requests.HTTPError as e:
@@ -98,7 +114,7 @@ class _CMCClient:
         *,
         interval: str = "daily",
         convert: str = "USD",
-    ) -> List[OHLCVPoint]:
+    ) -> Iterator[OHLCVPoint]:
         # CoinMarketCap typically expects 'daily', 'weekly', etc. Map common aliases.
         interval_map = {"1d": "daily", "daily": "daily"}
         interval_param = interval_map.get(interval, interval)
@@ -109,22 +125,30 @@ class _CMCClient:
                 return dt.replace(microsecond=0).isoformat()
             return dt.astimezone().replace(microsecond=0).isoformat()
 
-        params = {
-            "symbol": symbol.upper(),
-            "convert": convert.upper(),
-            "time_start": _fmt(start),
-            "time_end": _fmt(end),
-            "interval": interval_param,
-        }
-        data = self.get("/v2/cryptocurrency/ohlcv/historical", params=params)
-        data_obj = data.get("data", {})
-        quotes = data_obj.get("quotes", [])
-        out: List[OHLCVPoint] = []
-        for q in quotes:
-            ts = datetime.fromisoformat(q["time_open"].replace("Z", "+00:00"))
-            conv = q.get("quote", {}).get(convert.upper(), {})
-            out.append(
-                OHLCVPoint(
+        # Only daily history is windowed; other intervals keep a single request
+        window = _OHLCV_WINDOW if interval_param == "daily" else end - start
+        last_ts: Optional[datetime] = None
+        window_start = start
+        while True:
+            window_end = min(window_start + window, end)
+            params = {
+                "symbol": symbol.upper(),
+                "convert": convert.upper(),
+                "time_start": _fmt(window_start),
+                "time_end": _fmt(window_end),
+                "interval": interval_param,
+            }
+            data = self.get("/v2/cryptocurrency/ohlcv/historical", params=params)
+            data_obj = data.get("data", {})
+            quotes = data_obj.get("quotes", [])
+            for q in quotes:
+                ts = datetime.fromisoformat(q["time_open"].replace("Z", "+00:00"))
+                # Window boundaries are inclusive; skip the overlapping candle
+                if last_ts is not None and ts <= last_ts:
+                    continue
+                last_ts = ts
+                conv = q.get("quote", {}).get(convert.upper(), {})
+                yield OHLCVPoint(
                     ts=ts,
                     open=Decimal(str(conv.get("open"))),
                     high=Decimal(str(conv.get("high"))),
@@ -134,8 +158,9 @@ class _CMCClient:
                     if conv.get("volume") is not None
                     else None,
                 )
-            )
-        return out
+            if window_end >= end:
+                break
+            window_start = window_end
 
 
 @register_price_source
@@ -164,7 +189,7 @@ class CoinMarketCapPriceSource:
         end: datetime,
         interval: str = "1d",
         quote: str = "USD",
-    ) -> List[OHLCVPoint]:
+    ) -> Iterator[OHLCVPoint]:
         interval_alias = "daily" if interval in ("1d", "daily") else interval
         return self.client.ohlcv_historical(
             symbol, start, end, interval=interval_alias, convert=quote
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def _pool_maxsize() -> int:
+    """Connections kept per host; override with ``WEALTH_HTTP_POOL_SIZE``.
+
+    Should be at least the number of concurrent fetches (``price sync --workers``)
+    so parallel requests reuse keep-alive connections instead of opening and
+    discarding extra ones.
+    """
+    raw = os.getenv("WEALTH_HTTP_POOL_SIZE")
+    try:
+        return max(1, int(raw)) if raw else 16
+    except ValueError:
+        return 16
+
+
+HTTP_POOL_MAXSIZE = _pool_maxsize()
+
+
+def build_session(*, pool_maxsize: int = HTTP_POOL_MAXSIZE) -> requests.Session:
+    """Pooled keep-alive session with retries for transient provider errors."""
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 502, 503),
+        allowed_methods=frozenset({"GET"}),
+        # Hand the final response back so callers can report the error payload
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
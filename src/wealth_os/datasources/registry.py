@@ -1,31 +1,98 @@
 from __future__ import annotations
 
-from typing import Dict, Type
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Type
 
 from .base import PriceDataSource, TxImportSource
 
 
+DEFAULT_PROVIDER_ORDER = "coinmarketcap,coindesk"
+
 _PRICE_SOURCES: Dict[str, Type[PriceDataSource]] = {}
 _IMPORT_SOURCES: Dict[str, Type[TxImportSource]] = {}
+# Read-only live views handed to callers: no copy per lookup, and they always
+# reflect later registrations, so there is nothing to invalidate
+_PRICE_SOURCES_VIEW: Mapping[str, Type[PriceDataSource]] = MappingProxyType(
+    _PRICE_SOURCES
+)
+_IMPORT_SOURCES_VIEW: Mapping[str, Type[TxImportSource]] = MappingProxyType(
+    _IMPORT_SOURCES
+)
+# One shared instance per provider class (keeps HTTP sessions/ID caches warm)
+_PRICE_SOURCE_INSTANCES: Dict[Type[PriceDataSource], PriceDataSource] = {}
+_INSTANCES_LOCK = threading.Lock()
 
 
 def register_price_source(cls: Type[PriceDataSource]) -> Type[PriceDataSource]:
     _PRICE_SOURCES[cls.id()] = cls
+    get_price_source_names.cache_clear()
     return cls
 
 
 def register_import_source(cls: Type[TxImportSource]) -> Type[TxImportSource]:
     _IMPORT_SOURCES[cls.id()] = cls
+    get_import_source_names.cache_clear()
     return cls
 
 
-def get_price_sources() -> Dict[str, Type[PriceDataSource]]:
-    return dict(_PRICE_SOURCES)
+@lru_cache(maxsize=1)
+def get_price_source_names() -> tuple[str, ...]:
+    """Sorted names of registered price sources (recomputed after registration)."""
+    return tuple(sorted(_PRICE_SOURCES))
+
+
+@lru_cache(maxsize=1)
+def get_import_source_names() -> tuple[str, ...]:
+    """Sorted names of registered import sources (recomputed after registration)."""
+    return tuple(sorted(_IMPORT_SOURCES))
+
+
+def get_price_sources() -> Mapping[str, Type[PriceDataSource]]:
+    """Live read-only view of registered price sources.
+
+    Test membership with ``name in get_price_sources()``: a hash lookup that
+    allocates nothing and sees providers registered later.
+    """
+    return _PRICE_SOURCES_VIEW
 
 
 def get_price_source_cls(name: str) -> Type[PriceDataSource] | None:
     return _PRICE_SOURCES.get(name)
 
 
-def get_import_sources() -> Dict[str, Type[TxImportSource]]:
-    return dict(_IMPORT_SOURCES)
+def get_price_source(name: str) -> PriceDataSource | None:
+    """Return the shared instance of provider ``name`` or None if unknown.
+
+    Construction errors (e.g. a missing API key) propagate and are not cached,
+    so a later call can succeed once the environment is fixed.
+    """
+    cls = _PRICE_SOURCES.get(name)
+    if cls is None:
+        return None
+    inst = _PRICE_SOURCE_INSTANCES.get(cls)
+    if inst is None:
+        with _INSTANCES_LOCK:
+            inst = _PRICE_SOURCE_INSTANCES.get(cls)
+            if inst is None:
+                inst = cls()  # type: ignore[call-arg]
+                _PRICE_SOURCE_INSTANCES[cls] = inst
+    return inst
+
+
+def get_import_sources() -> Mapping[str, Type[TxImportSource]]:
+    return _IMPORT_SOURCES_VIEW
+
+
+@lru_cache(maxsize=16)
+def parse_provider_order(raw: str) -> tuple[str, ...]:
+    """Split a comma-separated provider list into trimmed, de-duplicated names."""
+    seen: set[str] = set()
+    out: list[str] = []
+    for name in raw.split(","):
+        name = name.strip()
+        if name and name not in seen:
+            seen.add(name)
+            out.append(name)
+    return tuple(out)
@@ -1,8 +1,9 @@
-from .engine import get_engine, init_db
+from .engine import get_engine, get_sessionmaker, init_db
 from . import models  # ensure models are imported for metadata registration
 
 __all__ = [
     "get_engine",
+    "get_sessionmaker",
     "init_db",
     "models",
 ]
@@ -1,8 +1,52 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 
-from sqlmodel import SQLModel, create_engine
+from sqlalchemy import Engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from sqlmodel import Session, SQLModel, create_engine
+
+
+# Applied to every new pool connection. WAL + synchronous=NORMAL avoids a full
+# fsync per commit, which dominates bulk price ingestion.
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def _on_connect(dbapi_connection, connection_record) -> None:
+    # Let SQLAlchemy emit BEGIN itself (see _on_begin); pysqlite's implicit
+    # transaction handling otherwise breaks SAVEPOINT / begin_nested().
+    dbapi_connection.isolation_level = None
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+# Connections are reused across requests and threads. The API threadpool and
+# `price sync --workers` can hold several at once; past the overflow limit,
+# callers wait up to `pool_timeout` seconds. Pre-ping and recycling are left
+# off because a local file has no server that could drop idle connections.
+_POOL_SIZE = 8
+_POOL_MAX_OVERFLOW = 16
+_POOL_TIMEOUT = 30
+
+
+def _on_begin(conn) -> None:
+    # Under WAL a deferred transaction that reads and then writes fails with
+    # SQLITE_BUSY_SNAPSHOT if another connection committed in between; writing
+    # sessions take the write lock up front instead (see get_sessionmaker).
+    mode = conn.get_execution_options().get("sqlite_begin", "DEFERRED")
+    conn.exec_driver_sql(f"BEGIN {mode}")
 
 
 def _sqlite_url(db_path: str) -> str:
@@ -11,20 +55,81 @@ def _sqlite_url(db_path: str) -> str:
     return f"sqlite:///{path}"
 
 
-def get_engine(db_path: str):
+@lru_cache(maxsize=4)
+def _database(db_path: str) -> tuple[Engine, dict[bool, sessionmaker]]:
+    """Engine for ``db_path`` plus its read and write session factories.
+
+    One cache entry holds all three, so a factory never outlives (or binds
+    to a different pool than) the engine ``get_engine`` returns for the path.
+    """
     url = _sqlite_url(db_path)
-    engine = create_engine(url, echo=False, connect_args={"check_same_thread": False})
-    return engine
+    engine = create_engine(
+        url,
+        echo=False,
+        connect_args={"check_same_thread": False},
+        poolclass=QueuePool,
+        pool_size=_POOL_SIZE,
+        max_overflow=_POOL_MAX_OVERFLOW,
+        pool_timeout=_POOL_TIMEOUT,
+    )
+    event.listen(engine, "connect", _on_connect)
+    event.listen(engine, "begin", _on_begin)
+    makers = {
+        False: sessionmaker(bind=engine, class_=Session, expire_on_commit=False),
+        # Shares the engine's pool; only the BEGIN statement differs
+        True: sessionmaker(
+            bind=engine.execution_options(sqlite_begin="IMMEDIATE"),
+            class_=Session,
+            expire_on_commit=False,
+        ),
+    }
+    return engine, makers
+
 
+def get_engine(db_path: str) -> Engine:
+    """Return the process-wide engine for ``db_path`` (created on first use)."""
+    return _database(db_path)[0]
 
+
+def get_sessionmaker(db_path: str, write: bool = False) -> sessionmaker:
+    """Return the session factory bound to ``get_engine(db_path)``.
+
+    ``write=True`` sessions start with ``BEGIN IMMEDIATE`` so read-then-write
+    work waits on ``busy_timeout`` instead of failing mid-transaction.
+    """
+    return _database(db_path)[1][write]
+
+
+# Stored in ``PRAGMA user_version``. Bump when tables or indexes are added so
+# existing databases run the schema setup again.
+SCHEMA_VERSION = 4
+
+
+@lru_cache(maxsize=4)
 def init_db(db_path: str):
-    """Create the SQLite database file and all known tables."""
+    """Create the SQLite database file and all known tables.
+
+    Returns immediately once the database reports the current
+    ``SCHEMA_VERSION``; repeated calls in one process are memoized.
+    """
+    engine = get_engine(db_path)
+    with engine.connect() as conn:
+        if conn.exec_driver_sql("PRAGMA user_version").scalar() >= SCHEMA_VERSION:
+            return engine
+
     # Import models so metadata is populated
     from . import models  # noqa: F401
 
-    engine = get_engine(db_path)
-    # Connect once to ensure the file is created
-    with engine.connect():
-        pass
     SQLModel.metadata.create_all(engine)
+    # create_all skips existing tables entirely; add indexes introduced later
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT OR IGNORE INTO ledgerstate (id, tx_version) VALUES (1, 0)"
+        )
+        for ddl in models.LEDGER_TRIGGERS:
+            conn.exec_driver_sql(ddl)
+        conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
     return engine
@@ -6,6 +6,7 @@ from enum import Enum
 from typing import Optional
 
 from sqlalchemy import Column, Index, UniqueConstraint, String
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.dialects.sqlite import NUMERIC
 from sqlmodel import Field, SQLModel
 
@@ -88,7 +89,11 @@ class Transaction(SQLModel, table=True):
 
     # Relationships omitted for simplicity in v1
 
-    __table_args__ = (Index("ix_tx_account_ts", "account_id", "ts"),)
+    __table_args__ = (
+        Index("ix_tx_account_ts", "account_id", "ts"),
+        # Per-asset history in time order (tx list filtered by asset)
+        Index("ix_tx_asset_ts", "asset_symbol", "ts"),
+    )
 
 
 class Price(SQLModel, table=True):
@@ -104,9 +109,77 @@ class Price(SQLModel, table=True):
             "asset_symbol", "quote_ccy", "ts", name="uq_price_symbol_quote_ts"
         ),
         Index("ix_price_symbol_ts", "asset_symbol", "ts"),
+        # Covering index (id is the rowid): price lookups by asset/quote/ts
+        # range are answered from the index without touching the table
+        Index(
+            "ix_price_symbol_quote_ts_cover",
+            "asset_symbol",
+            "quote_ccy",
+            "ts",
+            "price",
+            "source",
+        ),
     )
 
 
 class AssetPreference(SQLModel, table=True):
     asset_symbol: str = Field(primary_key=True, foreign_key="asset.symbol")
     preferred_price_source: Optional[str] = Field(default=None, index=True)
+
+
+class LedgerState(SQLModel, table=True):
+    """Single row (id=1) whose ``tx_version`` changes on every transaction write.
+
+    Bumped by the SQLite triggers in ``LEDGER_TRIGGERS``, so writes from any
+    code path (CLI, imports, API) invalidate derived data such as
+    ``PositionSnapshot``.
+    """
+
+    id: int = Field(default=1, primary_key=True)
+    tx_version: int = Field(default=0)
+
+
+class PositionSnapshotState(SQLModel, table=True):
+    """Ledger version a scope's ``PositionSnapshot`` rows were built from."""
+
+    scope: int = Field(primary_key=True)  # account id, 0 = all accounts
+    tx_version: int
+    max_tx_ts: Optional[datetime] = Field(default=None)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class DecimalText(TypeDecorator):
+    """Decimal stored as TEXT; SQLite NUMERIC would round it through a float.
+
+    Derived values must round-trip exactly to match a fresh computation.
+    """
+
+    impl = String
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else str(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else Decimal(value)
+
+
+class PositionSnapshot(SQLModel, table=True):
+    """Held qty, open FIFO cost and realized PnL per asset, over all transactions."""
+
+    scope: int = Field(primary_key=True)
+    asset_symbol: str = Field(primary_key=True)
+    qty: Decimal = Field(sa_column=Column(DecimalText, nullable=False))
+    cost_open: Optional[Decimal] = Field(default=None, sa_column=Column(DecimalText))
+    realized_pnl: Decimal = Field(sa_column=Column(DecimalText, nullable=False))
+
+
+# Created by init_db (CREATE TRIGGER is not part of table metadata)
+LEDGER_TRIGGERS = tuple(
+    f"""CREATE TRIGGER IF NOT EXISTS trg_transaction_{op.lower()}_version
+    AFTER {op} ON "transaction"
+    BEGIN
+        UPDATE ledgerstate SET tx_version = tx_version + 1 WHERE id = 1;
+    END"""
+    for op in ("INSERT", "UPDATE", "DELETE")
+)
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional
+from itertools import islice
+from typing import Iterable, Iterator, Optional
 
+from sqlalchemy import and_, case, delete, func, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlmodel import Session, select
 
-from .engine import get_engine
+from .engine import get_sessionmaker
 from .models import (
     Account,
     AccountType,
@@ -16,13 +19,15 @@ from .models import (
     TxSide,
     ImportBatch,
     AssetPreference,
+    LedgerState,
+    PositionSnapshot,
+    PositionSnapshotState,
 )
 
 
 @contextmanager
-def session_scope(db_path: str):
-    engine = get_engine(db_path)
-    session = Session(engine, expire_on_commit=False)
+def session_scope(db_path: str, *, write: bool = False):
+    session = get_sessionmaker(db_path, write)()
     try:
         yield session
         session.commit()
@@ -196,6 +201,7 @@ def create_transaction(
         import_batch_id=import_batch_id,
         tags=tags,
     )
+    _note_ledger_write(session, tx)
     session.add(tx)
     session.flush()
     return tx
@@ -215,7 +221,14 @@ def list_transactions(
     until: Optional[datetime] = None,
     limit: int = 100,
     offset: int = 0,
+    before_id: Optional[int] = None,
 ) -> list[Transaction]:
+    """Transactions newest first (ties broken by id, descending).
+
+    ``before_id`` is a keyset cursor: return only rows that sort after the
+    transaction with that id (typically the last row of the previous page),
+    so deep pages cost an index seek instead of skipping ``offset`` rows.
+    """
     stmt = select(Transaction)
     if account_id is not None:
         stmt = stmt.where(Transaction.account_id == account_id)
@@ -227,14 +240,25 @@ def list_transactions(
         stmt = stmt.where(Transaction.ts >= since)
     if until is not None:
         stmt = stmt.where(Transaction.ts <= until)
-    stmt = stmt.order_by(Transaction.ts.desc()).limit(limit).offset(offset)
-    return list(session.exec(stmt))
+    if before_id is not None:
+        anchor = (
+            select(Transaction.ts).where(Transaction.id == before_id).scalar_subquery()
+        )
+        stmt = stmt.where(
+            or_(
+                Transaction.ts < anchor,
+                and_(Transaction.ts == anchor, Transaction.id < before_id),
+            )
+        )
+    stmt = stmt.order_by(Transaction.ts.desc(), Transaction.id.desc())
+    return list(session.exec(stmt.limit(limit).offset(offset)))
 
 
 def delete_transaction(session: Session, tx_id: int) -> bool:
     tx = get_transaction(session, tx_id)
     if not tx:
         return False
+    _note_ledger_write(session, tx)
     session.delete(tx)
     session.flush()
     return True
@@ -264,6 +288,8 @@ def update_transaction(
     tx = get_transaction(session, tx_id)
     if not tx:
         return None
+    # Both the old and the new account/assets need their positions refreshed
+    _note_ledger_write(session, tx)
     if ts is not None:
         tx.ts = ts
     if account_id is not None:
@@ -316,6 +342,7 @@ def update_transaction(
     except Exception:
         pass
 
+    _note_ledger_write(session, tx)
     session.add(tx)
     session.flush()
     return tx
@@ -396,16 +423,91 @@ def upsert_price(
     return row
 
 
-def list_prices(
+# SQLite caps bound parameters per statement (999 on older builds); 5 columns
+# per price row keeps each multi-row INSERT safely below that limit.
+PRICE_UPSERT_CHUNK = 450
+
+
+def upsert_prices_bulk(
     session: Session,
     *,
     asset_symbol: str,
-    quote_ccy: str = "USD",
-    since: Optional[datetime] = None,
-    until: Optional[datetime] = None,
-    limit: int = 1000,
-    offset: int = 0,
-) -> list[Price]:
+    quote_ccy: str,
+    source: str,
+    points: Iterable,
+) -> int:
+    """Insert or update many price points for one asset in multi-row statements.
+
+    Each point needs ``ts`` and ``close`` attributes (e.g. ``OHLCVPoint``).
+    ``points`` may be any iterable, including a generator; it is consumed one
+    chunk at a time so memory stays bounded. Returns the number of rows written.
+    """
+    sym = asset_symbol.upper()
+    qccy = quote_ccy.upper()
+    it = iter(points)
+    written = 0
+    while True:
+        rows = [
+            {
+                "asset_symbol": sym,
+                "quote_ccy": qccy,
+                "ts": p.ts,
+                "price": p.close,
+                "source": source,
+            }
+            for p in islice(it, PRICE_UPSERT_CHUNK)
+        ]
+        if not rows:
+            return written
+        if not written:
+            ensure_asset(session, sym)
+        session.execute(_price_upsert_stmt(rows))
+        written += len(rows)
+
+
+def upsert_price_rows(session: Session, rows: Iterable[dict]) -> int:
+    """Insert or update price rows for any mix of assets in batched statements.
+
+    Each row is a mapping with ``asset_symbol``, ``quote_ccy``, ``ts``,
+    ``price`` and ``source``. Missing assets are created with one lookup for
+    the whole batch. Returns the number of rows written.
+    """
+    batch = [
+        {
+            **r,
+            "asset_symbol": r["asset_symbol"].upper(),
+            "quote_ccy": r["quote_ccy"].upper(),
+        }
+        for r in rows
+    ]
+    if not batch:
+        return 0
+    syms = {r["asset_symbol"] for r in batch}
+    known = set(session.exec(select(Asset.symbol).where(Asset.symbol.in_(syms))))
+    for sym in syms - known:
+        session.add(Asset(symbol=sym))
+    session.flush()
+    for i in range(0, len(batch), PRICE_UPSERT_CHUNK):
+        session.execute(_price_upsert_stmt(batch[i : i + PRICE_UPSERT_CHUNK]))
+    return len(batch)
+
+
+def _price_upsert_stmt(rows: list[dict]):
+    stmt = sqlite_insert(Price.__table__).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=["asset_symbol", "quote_ccy", "ts"],
+        set_={"price": stmt.excluded.price, "source": stmt.excluded.source},
+    )
+
+
+def _prices_stmt(
+    asset_symbol: str,
+    quote_ccy: str,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    limit: int,
+    offset: int,
+):
     stmt = select(Price).where(
         Price.asset_symbol == asset_symbol.upper(), Price.quote_ccy == quote_ccy.upper()
     )
@@ -413,10 +515,44 @@ def list_prices(
         stmt = stmt.where(Price.ts >= since)
     if until is not None:
         stmt = stmt.where(Price.ts <= until)
-    stmt = stmt.order_by(Price.ts.desc()).limit(limit).offset(offset)
+    return stmt.order_by(Price.ts.desc()).limit(limit).offset(offset)
+
+
+def list_prices(
+    session: Session,
+    *,
+    asset_symbol: str,
+    quote_ccy: str = "USD",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 1000,
+    offset: int = 0,
+) -> list[Price]:
+    stmt = _prices_stmt(asset_symbol, quote_ccy, since, until, limit, offset)
     return list(session.exec(stmt))
 
 
+PRICE_STREAM_BATCH = 500
+
+
+def iter_prices(
+    session: Session,
+    *,
+    asset_symbol: str,
+    quote_ccy: str = "USD",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 1000,
+    offset: int = 0,
+) -> Iterator[Price]:
+    """Like `list_prices` but fetches rows in batches while iterating.
+
+    Must be consumed while ``session`` is open.
+    """
+    stmt = _prices_stmt(asset_symbol, quote_ccy, since, until, limit, offset)
+    yield from session.exec(stmt.execution_options(yield_per=PRICE_STREAM_BATCH))
+
+
 def get_last_price(
     session: Session,
     *,
@@ -449,12 +585,89 @@ def get_last_price(
     return session.exec(stmt).first()
 
 
+def get_last_prices(
+    session: Session,
+    *,
+    asset_symbols: Iterable[str],
+    quote_ccy: str = "USD",
+    as_of: datetime | None = None,
+) -> dict[str, Price]:
+    """Batched `get_last_price` for many assets in a single query.
+
+    Per asset, the latest row from the preferred source wins; otherwise the
+    latest row from any source. Assets without prices are absent from the result.
+    """
+    syms = {s.upper() for s in asset_symbols}
+    if not syms:
+        return {}
+    preferred_first = case(
+        (Price.source == AssetPreference.preferred_price_source, 0), else_=1
+    )
+    rn = (
+        func.row_number()
+        .over(
+            partition_by=Price.asset_symbol,
+            order_by=(preferred_first, Price.ts.desc()),
+        )
+        .label("rn")
+    )
+    ranked = (
+        select(Price.id, rn)
+        .outerjoin(AssetPreference, AssetPreference.asset_symbol == Price.asset_symbol)
+        .where(Price.asset_symbol.in_(syms), Price.quote_ccy == quote_ccy.upper())
+    )
+    if as_of is not None:
+        ranked = ranked.where(Price.ts <= as_of)
+    ranked = ranked.subquery()
+    stmt = select(Price).join(ranked, ranked.c.id == Price.id).where(ranked.c.rn == 1)
+    return {row.asset_symbol: row for row in session.exec(stmt)}
+
+
+def get_daily_price_coverage(
+    session: Session,
+    *,
+    asset_symbol: str,
+    quote_ccy: str = "USD",
+    start: datetime,
+    end: datetime,
+    sources: Iterable[str] | None = None,
+) -> tuple[datetime | None, datetime | None, int]:
+    """``(min_ts, max_ts, count)`` of stored daily candles in ``[start, end]``.
+
+    Only midnight rows count, so live quotes stored at arbitrary times never
+    look like synced history; ``sources`` limits the rows to those providers.
+    """
+    stmt = select(func.min(Price.ts), func.max(Price.ts), func.count()).where(
+        Price.asset_symbol == asset_symbol.upper(),
+        Price.quote_ccy == quote_ccy.upper(),
+        Price.ts >= start,
+        Price.ts <= end,
+        func.time(Price.ts) == "00:00:00",
+    )
+    if sources is not None:
+        stmt = stmt.where(Price.source.in_(list(sources)))
+    lo, hi, n = session.exec(stmt).one()
+    return lo, hi, n
+
+
 # Asset preference helpers
 def get_asset_preference(session: Session, symbol: str) -> Optional[str]:
     row = session.get(AssetPreference, symbol.upper())
     return row.preferred_price_source if row else None
 
 
+def get_asset_preferences(
+    session: Session, symbols: Iterable[str]
+) -> dict[str, Optional[str]]:
+    """Preferred source per symbol in one query (None where unset)."""
+    syms = {s.upper() for s in symbols}
+    if not syms:
+        return {}
+    stmt = select(AssetPreference).where(AssetPreference.asset_symbol.in_(syms))
+    found = {r.asset_symbol: r.preferred_price_source for r in session.exec(stmt)}
+    return {sym: found.get(sym) for sym in syms}
+
+
 def set_asset_preference(
     session: Session, symbol: str, provider: Optional[str]
 ) -> AssetPreference:
@@ -468,3 +681,80 @@ def set_asset_preference(
     session.add(row)
     session.flush()
     return row
+
+
+# Position snapshot helpers
+def get_tx_version(session: Session) -> int:
+    """Current ledger version; changes whenever any transaction is written."""
+    stmt = select(LedgerState.tx_version).where(LedgerState.id == 1)
+    return session.exec(stmt).first() or 0
+
+
+# Session.info keys: ledger version before the session's first transaction
+# write, and the (account_id, asset) pairs its writes touched
+_LEDGER_BASE_VERSION = "ledger_base_version"
+_LEDGER_TOUCHED = "ledger_touched"
+
+
+def _note_ledger_write(session: Session, tx: Transaction) -> None:
+    """Record that ``tx``'s account and assets change in this session.
+
+    Must run before the write is flushed, so the base version predates it.
+    """
+    if _LEDGER_BASE_VERSION not in session.info:
+        session.info[_LEDGER_BASE_VERSION] = get_tx_version(session)
+    touched = session.info.setdefault(_LEDGER_TOUCHED, set())
+    for sym in (tx.asset_symbol, tx.fee_asset):
+        if sym:
+            touched.add((tx.account_id, sym.upper()))
+
+
+def pop_ledger_writes(session: Session) -> tuple[int | None, set[tuple[int, str]]]:
+    """``(base_version, touched)`` for this session's transaction writes, then reset.
+
+    ``base_version`` is None when the session wrote no transactions.
+    """
+    base = session.info.pop(_LEDGER_BASE_VERSION, None)
+    return base, session.info.pop(_LEDGER_TOUCHED, set())
+
+
+def get_position_snapshot(
+    session: Session, scope: int, *, tx_version: int
+) -> tuple[PositionSnapshotState, list[PositionSnapshot]] | None:
+    """Stored positions for ``scope`` if they were built at ``tx_version``."""
+    state = session.get(PositionSnapshotState, scope)
+    if state is None or state.tx_version != tx_version:
+        return None
+    rows = session.exec(
+        select(PositionSnapshot).where(PositionSnapshot.scope == scope)
+    ).all()
+    return state, list(rows)
+
+
+def replace_position_snapshot(
+    session: Session,
+    scope: int,
+    *,
+    tx_version: int,
+    max_tx_ts: Optional[datetime],
+    rows: Iterable[PositionSnapshot],
+    assets: Optional[Iterable[str]] = None,
+) -> None:
+    """Swap the stored positions for ``scope`` and record their ledger version.
+
+    With ``assets``, only those assets' rows are replaced; ``rows`` then holds
+    their new positions and every other stored asset is kept.
+    """
+    stmt = delete(PositionSnapshot).where(PositionSnapshot.scope == scope)
+    if assets is not None:
+        stmt = stmt.where(PositionSnapshot.asset_symbol.in_(list(assets)))
+    session.execute(stmt)
+    session.add_all(rows)
+    state = session.get(PositionSnapshotState, scope)
+    if state is None:
+        state = PositionSnapshotState(scope=scope, tx_version=tx_version)
+    state.tx_version = tx_version
+    state.max_tx_ts = max_tx_ts
+    state.updated_at = datetime.utcnow()
+    session.add(state)
+    session.flush()
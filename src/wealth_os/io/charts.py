@@ -12,7 +12,7 @@ matplotlib.use("Agg")
 import matplotlib.pyplot as plt  # noqa: E402
 import seaborn as sns  # noqa: E402
 
-from wealth_os.core.valuation import summarize_portfolio
+from wealth_os.core.valuation import portfolio_value_series, summarize_portfolio
 from wealth_os.db.repo import session_scope
 
 
@@ -70,16 +70,12 @@ def generate_value_timeseries_line(
     account_id: Optional[int] = None,
 ) -> Path:
     _ensure_parent(out)
-    xs: List[datetime] = []
-    ys: List[float] = []
+    xs: List[datetime] = [
+        datetime(d.year, d.month, d.day, 23, 59, 59)
+        for d in _daterange(since.date(), until.date())
+    ]
     with session_scope(db_path) as s:
-        for d in _daterange(since.date(), until.date()):
-            as_of = datetime(d.year, d.month, d.day, 23, 59, 59)
-            positions, totals = summarize_portfolio(
-                s, as_of=as_of, quote=quote, account_id=account_id
-            )
-            xs.append(as_of)
-            ys.append(float(totals["value"]))
+        ys = portfolio_value_series(s, points=xs, quote=quote, account_id=account_id)
 
     plt.figure(figsize=(9, 4))
     sns.set_style("whitegrid")
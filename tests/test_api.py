@@ -0,0 +1,255 @@
+import json
+import logging
+import sqlite3
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func
+from sqlmodel import select
+
+from wealth_os.api import server
+from wealth_os.core.config import get_config
+from wealth_os.datasources import registry
+from wealth_os.datasources.base import OHLCVPoint, PriceQuote
+from wealth_os.datasources.cache import quote_cache
+from wealth_os.db.models import Account, AccountType, Transaction, TxSide
+from wealth_os.db.repo import (
+    create_account,
+    create_transaction,
+    get_asset_preference,
+    list_prices,
+    session_scope,
+)
+
+
+def test_persist_quote_stores_row_and_logs_failures(monkeypatch, caplog):
+    q = PriceQuote(
+        symbol="BTC", quote_ccy="USD", price=Decimal(70000), ts=datetime(2024, 3, 1)
+    )
+    server._persist_quote("btc", q, "fake")
+    with session_scope(get_config().db_path) as s:
+        assert [p.price for p in list_prices(s, asset_symbol="BTC")] == [70000]
+        assert get_asset_preference(s, "BTC") == "fake"
+
+    def boom(*args, **kwargs):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(server, "_store_quote", boom)
+    with caplog.at_level(logging.ERROR, logger=server.__name__):
+        server._persist_quote("btc", q, "fake")
+    assert "Failed to persist btc quote from fake" in caplog.text
+    assert "disk full" in caplog.text
+
+
+def _list(**kwargs):
+    params = dict(
+        account_id=None,
+        asset_symbol=None,
+        side=None,
+        since=None,
+        until=None,
+        limit=100,
+        offset=0,
+        cursor=None,
+    )
+    params.update(kwargs)
+    return server.api_list_transactions(**params)
+
+
+def test_list_transactions_cursor_round_trip():
+    with session_scope(get_config().db_path) as s:
+        acc = create_account(s, name="Pages", type_=AccountType.exchange)
+        for day in range(5):
+            create_transaction(
+                s,
+                ts=datetime(2024, 1, 1 + day // 2),
+                account_id=acc.id,
+                asset_symbol="BTC",
+                side=TxSide.buy,
+                qty=Decimal(1),
+            )
+
+    expected = [row["id"] for row in json.loads(_list().body)]
+    seen, cursor = [], None
+    while True:
+        resp = _list(limit=2, cursor=cursor)
+        seen += [row["id"] for row in json.loads(resp.body)]
+        cursor = resp.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        cursor = int(cursor)
+    assert seen == expected
+
+    with pytest.raises(HTTPException) as exc:
+        _list(cursor=9999)
+    assert exc.value.status_code == 400
+
+
+class FakeQuoteSource:
+    calls = 0
+    age = timedelta(0)
+
+    @classmethod
+    def id(cls) -> str:
+        return "fake"
+
+    def get_quote(self, symbol, quote="USD"):
+        type(self).calls += 1
+        ts = datetime.utcnow() - self.age
+        return PriceQuote(symbol=symbol, quote_ccy=quote, price=Decimal(100), ts=ts)
+
+    def get_ohlcv(self, symbol, start, end, interval="1d", quote="USD"):
+        return []
+
+
+@pytest.fixture()
+def fake_quotes(monkeypatch):
+    monkeypatch.setitem(registry._PRICE_SOURCES, "fake", FakeQuoteSource)
+    monkeypatch.setattr(server, "_base_order", lambda: ("fake",))
+    monkeypatch.setattr(FakeQuoteSource, "calls", 0)
+    registry.get_price_source_names.cache_clear()
+    quote_cache.clear()
+    yield FakeQuoteSource
+    quote_cache.clear()
+    registry.get_price_source_names.cache_clear()
+
+
+def test_quote_levels_memory_then_stored_then_provider(fake_quotes):
+    with session_scope(get_config().db_path) as s:
+        # Cold: the provider is called and the quote is stored via _store_quote
+        q = server._latest_quote(s, "btc", "USD")
+        assert (q.source, fake_quotes.calls) == ("fake", 1)
+        assert len(list_prices(s, asset_symbol="BTC")) == 1
+        assert get_asset_preference(s, "BTC") == "fake"
+
+        # L1: served from quote_cache without touching the provider
+        assert server._fetch_quote("BTC", "USD", session=s)[2] is False
+        assert fake_quotes.calls == 1
+
+        # L2: with the memory cache empty, the fresh stored row answers
+        quote_cache.clear()
+        hit = server._fetch_quote("BTC", "USD", session=s)
+        assert (hit[1], hit[2], fake_quotes.calls) == ("fake", False, 1)
+        assert quote_cache.get(("fake", "BTC", "USD")) is not None
+
+
+def test_stale_stored_quote_falls_through_to_provider(fake_quotes, monkeypatch):
+    age = timedelta(seconds=server._QUOTE_MAX_AGE_SECONDS + 60)
+    monkeypatch.setattr(FakeQuoteSource, "age", age)
+    with session_scope(get_config().db_path) as s:
+        server._latest_quote(s, "BTC", "USD")
+        quote_cache.clear()
+        hit = server._fetch_quote("BTC", "USD", session=s)
+    assert hit[2] is True
+    assert fake_quotes.calls == 2
+
+
+def test_portfolio_summary_refresh_writes_one_bulk_upsert(fake_quotes, monkeypatch):
+    with session_scope(get_config().db_path) as s:
+        acc = create_account(s, name="Live", type_=AccountType.exchange)
+        for sym in ("BTC", "ETH"):
+            create_transaction(
+                s,
+                ts=datetime(2024, 1, 1),
+                account_id=acc.id,
+                asset_symbol=sym,
+                side=TxSide.buy,
+                qty=Decimal(2),
+                total_quote=Decimal(50),
+            )
+
+    calls = []
+    real = server.upsert_price_rows
+
+    def recording(session, rows):
+        rows = list(rows)
+        calls.append(rows)
+        return real(session, rows)
+
+    real_quote = FakeQuoteSource.get_quote
+
+    def unlocked_quote(self, symbol, quote="USD"):
+        # Provider calls must not run while this request holds the write lock
+        other = sqlite3.connect(get_config().db_path, timeout=0, isolation_level=None)
+        try:
+            other.execute("BEGIN IMMEDIATE")
+            other.execute("ROLLBACK")
+        finally:
+            other.close()
+        return real_quote(self, symbol, quote)
+
+    monkeypatch.setattr(FakeQuoteSource, "get_quote", unlocked_quote)
+    monkeypatch.setattr(server, "upsert_price_rows", recording)
+    body = json.loads(server.api_portfolio_summary(quote="USD", account_id=None).body)
+
+    assert len(calls) == 1
+    assert sorted((r["asset_symbol"], r["source"]) for r in calls[0]) == [
+        ("BTC", "fake"),
+        ("ETH", "fake"),
+    ]
+    assert Decimal(body["totals"]["value"]) == Decimal(400)
+    with session_scope(get_config().db_path) as s:
+        assert get_asset_preference(s, "ETH") == "fake"
+
+
+def test_stats_matches_separate_counts():
+    with session_scope(get_config().db_path) as s:
+        acc = create_account(s, name="Busy", type_=AccountType.exchange)
+        create_account(s, name="Idle", type_=AccountType.wallet)
+        for day in range(3):
+            create_transaction(
+                s,
+                ts=datetime(2024, 1, 1 + day),
+                account_id=acc.id,
+                asset_symbol="BTC",
+                side=TxSide.buy,
+                qty=Decimal(1),
+            )
+        acc_id = acc.id
+
+    for account_id in (None, acc_id):
+        with session_scope(get_config().db_path) as s:
+            accounts = select(func.count(Account.id))
+            txs = select(func.count(Transaction.id))
+            if account_id is not None:
+                accounts = accounts.where(Account.id == account_id)
+                txs = txs.where(Transaction.account_id == account_id)
+            expected = {
+                "accounts": s.exec(accounts).one(),
+                "transactions": s.exec(txs).one(),
+            }
+        assert server.api_stats(account_id=account_id) == expected
+    assert server.api_stats(account_id=None) == {"accounts": 2, "transactions": 3}
+
+
+def test_value_series_backfills_daily_prices_outside_the_read(fake_quotes, monkeypatch):
+    def daily(self, symbol, start, end, interval="1d", quote="USD"):
+        day = datetime(start.year, start.month, start.day)
+        while day <= end:
+            yield OHLCVPoint(ts=day, open=1, high=1, low=1, close=Decimal(100))
+            day += timedelta(days=1)
+
+    monkeypatch.setattr(FakeQuoteSource, "get_ohlcv", daily)
+    with session_scope(get_config().db_path) as s:
+        acc = create_account(s, name="Series", type_=AccountType.exchange)
+        create_transaction(
+            s,
+            ts=datetime(2024, 1, 1),
+            account_id=acc.id,
+            asset_symbol="BTC",
+            side=TxSide.buy,
+            qty=Decimal(1),
+        )
+
+    out = server.api_value_series(
+        since=datetime(2024, 1, 2),
+        until=datetime(2024, 1, 6),
+        account_id=None,
+        quote="USD",
+    )
+    assert [p.value for p in out] == [100.0] * 5
+    with session_scope(get_config().db_path) as s:
+        assert len(list_prices(s, asset_symbol="BTC")) == 5
+        assert get_asset_preference(s, "BTC") == "fake"
@@ -0,0 +1,36 @@
+import time
+
+import pytest
+
+from wealth_os.datasources.cache import TTLCache
+
+
+def test_ttl_cache_computes_once_until_expiry():
+    cache = TTLCache(ttl=0.05)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_compute("k", compute) == 1
+    assert cache.get_or_compute("k", compute) == 1
+    time.sleep(0.06)
+    assert cache.get_or_compute("k", compute) == 2
+
+
+def test_ttl_cache_evicts_lru_and_skips_failures():
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    def boom():
+        raise RuntimeError("provider down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("d", boom)
+    assert cache.get("d") is None
@@ -0,0 +1,273 @@
+import sqlite3
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from typer.testing import CliRunner
+
+from wealth_os import app as wealth_app
+from wealth_os.core.config import get_config
+from wealth_os.datasources import registry
+from wealth_os.datasources.base import OHLCVPoint, RateLimitError
+from wealth_os.db.repo import (
+    get_asset_preference,
+    list_prices,
+    session_scope,
+    upsert_price_rows,
+)
+
+
+class FakePriceSource:
+    # Added to every close, to simulate a candle that moved since the last run
+    bump = 0
+
+    @classmethod
+    def id(cls) -> str:
+        return "fake"
+
+    def get_quote(self, symbol, quote="USD"):
+        raise NotImplementedError
+
+    def get_ohlcv(self, symbol, start, end, interval="1d", quote="USD"):
+        if symbol == "NOPE":
+            return []
+        out = []
+        ts = start
+        while ts <= end:
+            p = Decimal(len(symbol) * 100 + ts.day + self.bump)
+            out.append(OHLCVPoint(ts=ts, open=p, high=p, low=p, close=p))
+            ts += timedelta(days=1)
+        return out
+
+    def resolve_symbol_id(self, symbol):
+        return symbol
+
+
+def test_price_sync_stores_points_for_all_symbols(monkeypatch, tmp_db_path):
+    monkeypatch.setitem(registry._PRICE_SOURCES, "fake", FakePriceSource)
+    runner = CliRunner()
+    r = runner.invoke(
+        wealth_app,
+        [
+            "price",
+            "sync",
+            "--assets",
+            "btc, eth,SOL",
+            "--since",
+            "2024-01-01",
+            "--until",
+            "2024-01-10",
+            "--quote",
+            "USD",
+            "--providers",
+            "fake",
+        ],
+    )
+    assert r.exit_code == 0, r.output
+    assert "Inserted/updated 30 price points across 3 assets." in r.output
+
+    cfg = get_config()
+    with session_scope(cfg.db_path) as s:
+        for sym in ("BTC", "ETH", "SOL"):
+            rows = list_prices(s, asset_symbol=sym, quote_ccy="USD")
+            assert len(rows) == 10
+            assert rows[0].ts == datetime(2024, 1, 10)
+            assert get_asset_preference(s, sym) == "fake"
+
+
+def test_price_sync_reports_failed_symbols(monkeypatch, tmp_db_path):
+    monkeypatch.setitem(registry._PRICE_SOURCES, "fake", FakePriceSource)
+    runner = CliRunner()
+    r = runner.invoke(
+        wealth_app,
+        [
+            "price",
+            "sync",
+            "--assets",
+            "BTC,NOPE",
+            "--since",
+            "2024-01-01",
+            "--until",
+            "2024-01-03",
+            "--quote",
+            "USD",
+            "--providers",
+            "fake",
+        ],
+    )
+    assert r.exit_code == 1
+    assert "Failed to sync NOPE" in r.output
+
+    # Symbols that did sync are kept
+    cfg = get_config()
+    with session_scope(cfg.db_path) as s:
+        assert len(list_prices(s, asset_symbol="BTC", quote_ccy="USD")) == 3
+
+
+def test_price_sync_only_fetches_missing_days(monkeypatch, tmp_db_path):
+    monkeypatch.setitem(registry._PRICE_SOURCES, "fake", FakePriceSource)
+    runner = CliRunner()
+
+    def sync(until):
+        return runner.invoke(
+            wealth_app,
+            [
+                "price",
+                "sync",
+                "--assets",
+                "BTC",
+                "--since",
+                "2024-01-01",
+                "--until",
+                until,
+                "--providers",
+                "fake",
+            ],
+        )
+
+    assert sync("2024-01-05").exit_code == 0
+    r = sync("2024-01-07")
+    assert r.exit_code == 0, r.output
+    # The newest stored day is fetched again along with the missing ones
+    assert "from 2024-01-05" in r.output
+    assert "Inserted/updated 3 price points" in r.output
+
+    # The last stored candle was partial: its close is overwritten next run
+    monkeypatch.setattr(FakePriceSource, "bump", 50)
+    r = sync("2024-01-07")
+    assert r.exit_code == 0, r.output
+    assert "from 2024-01-07" in r.output
+    assert "Inserted/updated 1 price points" in r.output
+
+    cfg = get_config()
+    with session_scope(cfg.db_path) as s:
+        rows = list_prices(s, asset_symbol="BTC", quote_ccy="USD")
+        assert len(rows) == 7
+        closes = {row.ts.day: row.price for row in rows}
+        assert closes[7] == 300 + 7 + 50
+        assert closes[6] == 300 + 6
+
+
+class FlakyPriceSource(FakePriceSource):
+    @classmethod
+    def id(cls) -> str:
+        return "flaky"
+
+    def get_ohlcv(self, symbol, start, end, interval="1d", quote="USD"):
+        # First page arrives, the second request is rate limited
+        yield OHLCVPoint(ts=start, open=1, high=1, low=1, close=Decimal(1))
+        raise RateLimitError("HTTP 429", retry_after=1)
+
+
+def test_price_sync_falls_back_when_a_later_page_fails(monkeypatch, tmp_db_path):
+    monkeypatch.setitem(registry._PRICE_SOURCES, "fake", FakePriceSource)
+    monkeypatch.setitem(registry._PRICE_SOURCES, "flaky", FlakyPriceSource)
+    runner = CliRunner()
+    r = runner.invoke(
+        wealth_app,
+        [
+            "price",
+            "sync",
+            "--assets",
+            "BTC",
+            "--since",
+            "2024-01-01",
+            "--until",
+            "2024-01-03",
+            "--providers",
+            "flaky,fake",
+        ],
+    )
+    assert r.exit_code == 0, r.output
+    assert "Provider flaky failed" in r.output
+
+    cfg = get_config()
+    with session_scope(cfg.db_path) as s:
+        rows = list_prices(s, asset_symbol="BTC", quote_ccy="USD")
+        assert {row.source for row in rows} == {"fake"}
+        assert get_asset_preference(s, "BTC") == "fake"
+
+
+def test_price_sync_ignores_live_quotes_and_backfills_earlier_since(
+    monkeypatch, tmp_db_path
+):
+    monkeypatch.setitem(registry._PRICE_SOURCES, "fake", FakePriceSource)
+    cfg = get_config()
+    with session_scope(cfg.db_path) as s:
+        upsert_price_rows(
+            s,
+            [
+                {
+                    "asset_symbol": "BTC",
+                    "quote_ccy": "USD",
+                    "ts": datetime(2024, 3, 1, 14, 5),
+                    "price": Decimal(70000),
+                    "source": "fake",
+                }
+            ],
+        )
+    runner = CliRunner()
+
+    def sync(since, until):
+        return runner.invoke(
+            wealth_app,
+            [
+                "price",
+                "sync",
+                "--assets",
+                "BTC",
+                "--since",
+                since,
+                "--until",
+                until,
+                "--providers",
+                "fake",
+            ],
+        )
+
+    r = sync("2024-01-01", "2024-02-28")
+    assert r.exit_code == 0, r.output
+    assert "from 2024-01-01" in r.output
+    assert "Inserted/updated 59 price points" in r.output
+
+    # An earlier --since is backfilled instead of reported as up to date
+    r = sync("2023-12-25", "2024-02-28")
+    assert r.exit_code == 0, r.output
+    assert "already up to date" not in r.output
+    assert "from 2023-12-25" in r.output
+
+
+class LockCheckingPriceSource(FakePriceSource):
+    def get_ohlcv(self, symbol, start, end, interval="1d", quote="USD"):
+        # Fetches must not run while the sync holds the SQLite write lock; a
+        # short per-symbol write may overlap, so allow it a moment to finish
+        other = sqlite3.connect(get_config().db_path, timeout=2, isolation_level=None)
+        try:
+            other.execute("BEGIN IMMEDIATE")
+            other.execute("ROLLBACK")
+        finally:
+            other.close()
+        return super().get_ohlcv(symbol, start, end, interval, quote)
+
+
+def test_price_sync_fetches_without_holding_the_write_lock(monkeypatch, tmp_db_path):
+    monkeypatch.setitem(registry._PRICE_SOURCES, "fake", LockCheckingPriceSource)
+    runner = CliRunner()
+    r = runner.invoke(
+        wealth_app,
+        [
+            "price",
+            "sync",
+            "--assets",
+            "BTC,ETH",
+            "--since",
+            "2024-01-01",
+            "--until",
+            "2024-01-03",
+            "--providers",
+            "fake",
+            "--workers",
+            "1",
+        ],
+    )
+    assert r.exit_code == 0, r.output
+    assert "Inserted/updated 6 price points" in r.output
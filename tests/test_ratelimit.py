@@ -0,0 +1,29 @@
+import time
+
+from wealth_os.core.ratelimit import TokenBucket, get_bucket
+
+
+def test_token_bucket_burst_then_paces():
+    bucket = TokenBucket(rate_per_sec=50, burst=2)
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    start = time.monotonic()
+    bucket.acquire()
+    # Third call waits for roughly one token (1/50s)
+    assert time.monotonic() - start >= 0.015
+
+
+def test_token_bucket_penalize_blocks_for_retry_after():
+    bucket = TokenBucket(rate_per_sec=1000, burst=5)
+    bucket.penalize(0.05)
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.04
+
+
+def test_get_bucket_reads_env(monkeypatch):
+    monkeypatch.setenv("WEALTH_RATE_TESTPROV", "0.5,3")
+    bucket = get_bucket("testprov")
+    assert bucket.rate == 0.5
+    assert bucket.capacity == 3
+    assert get_bucket("testprov") is bucket
@@ -1,6 +1,8 @@
 from datetime import datetime
 from decimal import Decimal
 
+import pytest
+
 from wealth_os.db.repo import (
     session_scope,
     create_account,
@@ -56,3 +58,189 @@ def test_account_and_tx_crud(tmp_db_path):
     with session_scope(cfg.db_path) as s:
         rows = list_transactions(s, account_id=acc_id)
         assert len(rows) == 0
+
+
+def test_upsert_prices_bulk_inserts_and_updates(tmp_db_path):
+    from types import SimpleNamespace
+
+    from wealth_os.db.repo import list_prices, upsert_prices_bulk
+
+    cfg = get_config()
+    t0 = datetime(2024, 1, 1)
+    points = [
+        SimpleNamespace(ts=t0.replace(day=d), close=Decimal(100 + d))
+        for d in range(1, 11)
+    ]
+    with session_scope(cfg.db_path) as s:
+        n = upsert_prices_bulk(
+            s, asset_symbol="btc", quote_ccy="usd", source="test", points=points
+        )
+        assert n == 10
+
+    # Re-upsert an overlapping window with new prices; existing rows are updated
+    with session_scope(cfg.db_path) as s:
+        upsert_prices_bulk(
+            s,
+            asset_symbol="BTC",
+            quote_ccy="USD",
+            source="other",
+            points=[SimpleNamespace(ts=t0.replace(day=10), close=Decimal("999"))],
+        )
+
+    with session_scope(cfg.db_path) as s:
+        rows = list_prices(s, asset_symbol="BTC", quote_ccy="USD")
+        assert len(rows) == 10
+        assert rows[0].ts == t0.replace(day=10)
+        assert Decimal(str(rows[0].price)) == Decimal("999")
+        assert rows[0].source == "other"
+
+
+def test_savepoint_rollback_keeps_outer_work(tmp_db_path):
+    cfg = get_config()
+    with session_scope(cfg.db_path) as s:
+        create_account(s, name="Kept", type_=AccountType.exchange)
+        try:
+            with s.begin_nested():
+                create_account(s, name="Dropped", type_=AccountType.exchange)
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+
+    with session_scope(cfg.db_path) as s:
+        names = {a.name for a in list_accounts(s)}
+    assert names == {"Kept"}
+
+
+def test_write_session_takes_the_write_lock_up_front(tmp_db_path):
+    import sqlite3
+
+    cfg = get_config()
+    with session_scope(cfg.db_path, write=True) as s:
+        list_accounts(s)
+        # The read above already holds the RESERVED lock, so a competing
+        # writer cannot commit between this session's read and its write
+        other = sqlite3.connect(cfg.db_path, timeout=0, isolation_level=None)
+        try:
+            with pytest.raises(sqlite3.OperationalError, match="locked"):
+                other.execute("BEGIN IMMEDIATE")
+        finally:
+            other.close()
+        create_account(s, name="Writer", type_=AccountType.exchange)
+
+
+def test_sessionmakers_share_the_engine_pool(tmp_path):
+    from wealth_os.db.engine import get_engine, get_sessionmaker
+
+    paths = [str(tmp_path / f"db{i}.sqlite") for i in range(6)]
+    for path in paths:
+        get_sessionmaker(path, True)
+    # Even after other paths pushed it out of the cache, a path's factories
+    # and engine are created together and share one pool
+    path = paths[0]
+    engine = get_engine(path)
+    assert get_sessionmaker(path, False).kw["bind"] is engine
+    assert get_sessionmaker(path, True).kw["bind"]._proxied is engine
+
+
+def test_get_last_prices_prefers_preferred_source(tmp_db_path):
+    from wealth_os.db.repo import (
+        get_last_price,
+        get_last_prices,
+        set_asset_preference,
+        upsert_price,
+    )
+
+    cfg = get_config()
+    rows = [
+        ("BTC", datetime(2024, 1, 1), "1", "a"),
+        ("BTC", datetime(2024, 1, 2), "2", "b"),
+        ("ETH", datetime(2024, 1, 1), "3", "a"),
+        ("ETH", datetime(2024, 1, 3), "4", "b"),
+    ]
+    with session_scope(cfg.db_path) as s:
+        for sym, ts, price, source in rows:
+            upsert_price(
+                s,
+                asset_symbol=sym,
+                quote_ccy="USD",
+                ts=ts,
+                price=Decimal(price),
+                source=source,
+            )
+        set_asset_preference(s, "BTC", "a")
+
+    with session_scope(cfg.db_path) as s:
+        got = get_last_prices(s, asset_symbols=["btc", "eth", "sol"], quote_ccy="usd")
+        assert set(got) == {"BTC", "ETH"}
+        for sym in ("BTC", "ETH"):
+            single = get_last_price(s, asset_symbol=sym, quote_ccy="USD")
+            assert got[sym].id == single.id
+        assert got["BTC"].source == "a"
+        assert got["ETH"].source == "b"
+        early = get_last_prices(s, asset_symbols=["ETH"], as_of=datetime(2024, 1, 2))
+        assert early["ETH"].ts == datetime(2024, 1, 1)
+
+
+def test_upsert_price_rows_mixed_assets(tmp_db_path):
+    from wealth_os.db.repo import get_asset, get_last_prices, upsert_price_rows
+
+    def row(sym, qccy, price, source):
+        ts = datetime(2024, 1, 1)
+        price = Decimal(price)
+        return dict(asset_symbol=sym, quote_ccy=qccy, ts=ts, price=price, source=source)
+
+    cfg = get_config()
+    with session_scope(cfg.db_path) as s:
+        n = upsert_price_rows(
+            s, [row("btc", "usd", "1", "a"), row("ETH", "USD", "2", "a")]
+        )
+        assert n == 2
+        # Same key again updates in place
+        upsert_price_rows(s, [row("BTC", "USD", "5", "b")])
+
+    with session_scope(cfg.db_path) as s:
+        assert get_asset(s, "ETH") is not None
+        got = get_last_prices(s, asset_symbols=["BTC", "ETH"])
+        assert got["BTC"].price == Decimal("5") and got["BTC"].source == "b"
+        assert got["ETH"].price == Decimal("2")
+
+
+def test_list_transactions_keyset_cursor_matches_offset(tmp_db_path):
+    cfg = get_config()
+    t0 = datetime(2024, 1, 1)
+    with session_scope(cfg.db_path) as s:
+        acc = create_account(s, name="Pages", type_=AccountType.exchange)
+        # Duplicate timestamps exercise the id tie-break
+        for i in range(7):
+            create_transaction(
+                s,
+                ts=t0.replace(day=1 + i // 2),
+                account_id=acc.id,
+                asset_symbol="BTC",
+                side=TxSide.buy,
+                qty=Decimal("1"),
+            )
+
+    with session_scope(cfg.db_path) as s:
+        by_offset = [t.id for t in list_transactions(s, limit=100)]
+        by_cursor: list[int] = []
+        cursor = None
+        while True:
+            page = list_transactions(s, limit=3, before_id=cursor)
+            by_cursor += [t.id for t in page]
+            if len(page) < 3:
+                break
+            cursor = page[-1].id
+    assert by_cursor == by_offset
+    assert len(by_offset) == 7
+
+
+def test_config_module_attribute_is_lazy(tmp_db_path):
+    import wealth_os
+    from wealth_os.core import config
+
+    assert config.CONFIG is get_config()
+    assert wealth_os.CONFIG is get_config()
+    assert config.CONFIG.db_path == str(tmp_db_path)
+    with pytest.raises(AttributeError):
+        config.MISSING
@@ -1,6 +1,9 @@
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+import pytest
+from sqlmodel import select
+
 from wealth_os.core.config import get_config
 from wealth_os.core.valuation import summarize_portfolio
 from wealth_os.db.repo import (
@@ -70,3 +73,169 @@ def test_fifo_valuation(tmp_db_path):
     assert Decimal("5000") == pos["BTC"].unrealized_pnl
     # Realized PnL = 45000 - (10000 + 0.5*20000) = 25000
     assert Decimal("25000") == pos["BTC"].realized_pnl
+
+
+def test_portfolio_value_series_matches_summaries(tmp_db_path):
+    from wealth_os.core.valuation import portfolio_timeline, portfolio_value_series
+
+    cfg = get_config()
+    t0 = datetime(2024, 1, 1, 12, 0, 0)
+    with session_scope(cfg.db_path) as s:
+        acc = create_account(s, name="Series", type_=AccountType.exchange)
+        for day, side, qty in ((1, TxSide.buy, "2"), (3, TxSide.sell, "0.5")):
+            create_transaction(
+                s,
+                ts=t0 + timedelta(days=day),
+                account_id=acc.id,
+                asset_symbol="BTC",
+                side=side,
+                qty=Decimal(qty),
+                total_quote=Decimal("1000"),
+                quote_ccy="USD",
+            )
+        for day in (0, 2, 4):
+            upsert_price(
+                s,
+                asset_symbol="BTC",
+                quote_ccy="USD",
+                ts=t0 + timedelta(days=day),
+                price=Decimal(100 + day),
+            )
+
+    points = [t0 + timedelta(days=d) for d in range(6)]
+    with session_scope(cfg.db_path) as s:
+        series = portfolio_value_series(s, points=points, quote="USD")
+        timeline = portfolio_timeline(s, points=points, quote="USD")
+        summaries = [summarize_portfolio(s, as_of=p, quote="USD")[1] for p in points]
+    assert series == [float(t["value"]) for t in summaries]
+    assert [t["value"] for t in timeline] == series
+    # The cost sweep runs in float; it agrees with the Decimal summaries to rounding
+    assert [t["cost_open"] for t in timeline] == pytest.approx(
+        [float(t["cost_open"]) for t in summaries]
+    )
+
+
+def test_position_snapshot_tracks_transaction_writes(tmp_db_path):
+    from wealth_os.db.models import PositionSnapshotState
+    from wealth_os.core.valuation import refresh_position_snapshots
+    from wealth_os.db.repo import delete_transaction, get_tx_version
+
+    cfg = get_config()
+    t0 = datetime(2024, 1, 1)
+    as_of = t0 + timedelta(days=10)
+    with session_scope(cfg.db_path) as s:
+        acc = create_account(s, name="Snap", type_=AccountType.exchange)
+        create_transaction(
+            s,
+            ts=t0,
+            account_id=acc.id,
+            asset_symbol="ETH",
+            side=TxSide.buy,
+            qty=Decimal("2"),
+            total_quote=Decimal("3000"),
+        )
+    with session_scope(cfg.db_path) as s:
+        # Without a refresh there is no snapshot and the read path never writes
+        _, totals = summarize_portfolio(s, as_of=as_of)
+        assert totals["cost_open"] == Decimal("3000")
+        assert s.get(PositionSnapshotState, 0) is None
+        refresh_position_snapshots(s)
+        assert s.get(PositionSnapshotState, 0) is None
+    with session_scope(cfg.db_path) as s:
+        create_transaction(
+            s,
+            ts=t0,
+            account_id=acc.id,
+            asset_symbol="BTC",
+            side=TxSide.buy,
+            qty=Decimal("1"),
+            total_quote=Decimal("1000"),
+        )
+        refresh_position_snapshots(s)
+    with session_scope(cfg.db_path) as s:
+        _, totals = summarize_portfolio(s, as_of=as_of)
+        assert totals["cost_open"] == Decimal("4000")
+        assert s.get(PositionSnapshotState, 0).tx_version == get_tx_version(s)
+
+    with session_scope(cfg.db_path) as s:
+        tx = create_transaction(
+            s,
+            ts=t0 + timedelta(days=1),
+            account_id=acc.id,
+            asset_symbol="ETH",
+            side=TxSide.sell,
+            qty=Decimal("1"),
+            total_quote=Decimal("2000"),
+        )
+        refresh_position_snapshots(s)
+    with session_scope(cfg.db_path) as s:
+        positions, totals = summarize_portfolio(s, as_of=as_of)
+        assert {p.asset: p.qty for p in positions}["ETH"] == Decimal("1")
+        assert totals["realized"] == Decimal("500")
+        # Before the newest transaction the snapshot does not apply
+        early, _ = summarize_portfolio(s, as_of=t0 + timedelta(hours=1))
+        assert {p.asset: p.qty for p in early}["ETH"] == Decimal("2")
+
+    with session_scope(cfg.db_path) as s:
+        delete_transaction(s, tx.id)
+        refresh_position_snapshots(s)
+    with session_scope(cfg.db_path) as s:
+        _, totals = summarize_portfolio(s, as_of=as_of)
+        assert totals["realized"] == Decimal("0")
+
+
+def test_incremental_snapshot_matches_full_replay(tmp_db_path):
+    from wealth_os.core.valuation import _replay, refresh_position_snapshots
+    from wealth_os.db.models import PositionSnapshot
+    from wealth_os.db.repo import delete_transaction, update_transaction
+
+    cfg = get_config()
+    t0 = datetime(2024, 1, 1)
+
+    def buy(s, acc, sym, day, qty, total, **kw):
+        return create_transaction(
+            s,
+            ts=t0 + timedelta(days=day),
+            account_id=acc,
+            asset_symbol=sym,
+            side=TxSide.buy,
+            qty=Decimal(qty),
+            total_quote=Decimal(total),
+            **kw,
+        )
+
+    def assert_matches_replay():
+        with session_scope(cfg.db_path) as s:
+            for scope in (0, a1, a2):
+                rows = s.exec(
+                    select(PositionSnapshot).where(PositionSnapshot.scope == scope)
+                ).all()
+                stored = {r.asset_symbol: (r.qty, r.cost_open) for r in rows}
+                held, cost, _ = _replay(s, as_of=datetime.max, account_id=scope or None)
+                assert stored == {sym: (q, cost.get(sym)) for sym, q in held.items()}
+
+    with session_scope(cfg.db_path) as s:
+        a1 = create_account(s, name="A1", type_=AccountType.exchange).id
+        a2 = create_account(s, name="A2", type_=AccountType.wallet).id
+        buy(s, a1, "BTC", 0, "1", "100")
+        buy(s, a2, "ETH", 0, "4", "40")
+        refresh_position_snapshots(s)
+    assert_matches_replay()
+
+    # Fee paid in ETH from A1: touches ETH in A1 and the all-accounts scope
+    with session_scope(cfg.db_path) as s:
+        buy(s, a1, "ETH", 1, "2", "30")
+        tx = buy(s, a1, "BTC", 2, "1", "300", fee_qty=Decimal("0.5"), fee_asset="ETH")
+        refresh_position_snapshots(s)
+    assert_matches_replay()
+
+    # Moving a transaction to another account and asset refreshes both sides
+    with session_scope(cfg.db_path) as s:
+        update_transaction(s, tx.id, account_id=a2, asset_symbol="SOL")
+        refresh_position_snapshots(s)
+    assert_matches_replay()
+
+    with session_scope(cfg.db_path) as s:
+        delete_transaction(s, tx.id)
+        refresh_position_snapshots(s)
+    assert_matches_replay()